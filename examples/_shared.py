@@ -0,0 +1,50 @@
+"""Helpers shared by the example scripts."""
+
+import functools
+
+import httpx
+
+from react_agent import ReactAgent
+
+# One pooled HTTP client shared by every agent, so consecutive requests reuse
+# open connections instead of reconnecting each time
+HTTP_CLIENT = httpx.Client(
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _make_agent(
+    model_name: str = "local-model",
+    base_url: str = "http://localhost:1234/v1",
+    max_tokens: int = 4096
+) -> ReactAgent:
+    """Build an agent once per configuration.
+
+    Construction sets up the LLM client, tokenizer and tools, so examples
+    that run back to back share one agent instead of rebuilding it.
+    """
+    return ReactAgent(
+        model_name=model_name,
+        base_url=base_url,
+        api_key="not-needed",
+        http_client=HTTP_CLIENT,
+        max_tokens=max_tokens
+    )
+
+
+def shared_agent(max_tokens: int = 4096) -> ReactAgent:
+    """Get the shared agent for a context size, in the state of a new one."""
+    agent = _make_agent(max_tokens=max_tokens)
+
+    # reset() keeps the context's lifetime counters, so clear them too
+    # before it re-adds the system prompt
+    context = agent.context_manager
+    context.compaction_count = 0
+    context.metadata = {
+        "total_messages": 0,
+        "compactions": 0,
+        "tokens_saved": 0
+    }
+    agent.reset()
+    return agent
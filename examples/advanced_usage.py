@@ -1,7 +1,37 @@
 """Advanced usage examples for ReactAgent."""
 
-from react_agent import ReactAgent, create_simple_tool
-from react_agent.utils import create_agent_from_config, AgentLogger
+import re
+
+from react_agent import ReactAgent, CompactionStrategy, create_simple_tool
+from react_agent.utils import create_agent_from_config, AgentLogger, RateLimiter
+
+from _shared import HTTP_CLIENT, shared_agent
+
+# Runs of non-whitespace, i.e. words
+_WORD = re.compile(r"\S+")
+
+
+def word_counter(text: str) -> str:
+    """Count words in text."""
+    # Count matches as the scanner finds them instead of building a list of words
+    count = sum(1 for _ in _WORD.finditer(text))
+    return f"Word count: {count}"
+
+
+def run_rate_limited(agent, limiter, task):
+    """Run a task once the rate limiter has room for it.
+
+    The token cost is estimated from the task text up front and corrected
+    from the agent's recorded usage afterwards.
+    """
+    estimated = agent.token_tracker.count_tokens(task)
+    limiter.acquire(estimated)
+
+    used_before = agent.get_token_usage()["total_tokens"]
+    result = agent.run(task)
+    limiter.reconcile(estimated, agent.get_token_usage()["total_tokens"] - used_before)
+
+    return result
 
 
 def example_config_based_agent():
@@ -30,7 +60,8 @@ def example_mcp_integration():
     agent = ReactAgent(
         model_name="local-model",
         base_url="http://localhost:1234/v1",
-        api_key="not-needed"
+        api_key="not-needed",
+        http_client=HTTP_CLIENT
     )
 
     # Add MCP server (example - would need actual MCP server running)
@@ -52,11 +83,6 @@ def example_mcp_integration():
     # Create a custom tool manually
     print("\nCreating custom tool manually...")
 
-    def word_counter(text: str) -> str:
-        """Count words in text."""
-        words = text.split()
-        return f"Word count: {len(words)}"
-
     custom_tool = create_simple_tool(
         "word_counter",
         "Count the number of words in a text string",
@@ -79,11 +105,7 @@ def example_with_logging():
     logger.info("Starting agent session")
 
     # Create agent
-    agent = ReactAgent(
-        model_name="local-model",
-        base_url="http://localhost:1234/v1",
-        api_key="not-needed"
-    )
+    agent = shared_agent()
 
     logger.info(f"Agent created with model: {agent.model_name}")
 
@@ -94,11 +116,13 @@ def example_with_logging():
         "Find configuration files",
     ]
 
+    limiter = RateLimiter(rpm=500, tpm=90_000)
+
     for task in tasks:
         logger.info(f"Executing task: {task}")
         try:
-            result = agent.run(task)
-            logger.info(f"Task completed successfully")
+            result = run_rate_limited(agent, limiter, task)
+            logger.info("Task completed successfully")
         except Exception as e:
             logger.error(f"Task failed: {str(e)}")
 
@@ -115,12 +139,16 @@ def example_context_compaction():
     print("Example: Context Compaction")
     print("=" * 60)
 
-    # Create agent with small context window
+    # Create agent with small context window. The attention-sink strategy
+    # keeps the opening messages plus a window of recent ones and drops the
+    # middle, so compaction needs no summarization step.
     agent = ReactAgent(
         model_name="local-model",
         base_url="http://localhost:1234/v1",
         api_key="not-needed",
-        max_tokens=1024  # Small context to trigger compaction
+        http_client=HTTP_CLIENT,
+        max_tokens=1024,  # Small context to trigger compaction
+        compaction_strategy=CompactionStrategy.attention_sink(sink_messages=4, window_messages=6)
     )
 
     print("Initial context state:")
@@ -128,8 +156,9 @@ def example_context_compaction():
 
     # Run many tasks to fill context
     print("\nRunning multiple tasks to fill context...")
+    limiter = RateLimiter(rpm=500, tpm=90_000)
     for i in range(10):
-        agent.run(f"Task {i + 1}: List files in directory")
+        run_rate_limited(agent, limiter, f"Task {i + 1}: List files in directory")
 
         if i % 3 == 0:
             print(f"\nAfter task {i + 1}:")
@@ -147,11 +176,7 @@ def example_token_tracking():
     print("Example: Token Tracking")
     print("=" * 60)
 
-    agent = ReactAgent(
-        model_name="local-model",
-        base_url="http://localhost:1234/v1",
-        api_key="not-needed"
-    )
+    agent = shared_agent()
 
     # Run some tasks
     tasks = [
@@ -190,7 +215,8 @@ def example_state_persistence():
     agent = ReactAgent(
         model_name="local-model",
         base_url="http://localhost:1234/v1",
-        api_key="not-needed"
+        api_key="not-needed",
+        http_client=HTTP_CLIENT
     )
 
     agent.run("List all Python files")
@@ -203,23 +229,22 @@ def example_state_persistence():
     )
     subagent.run("Analyze project structure")
 
-    # Export state
+    # Export state (pickle is the fastest format to write and read back)
     print("\nExporting agent state...")
-    agent.export_state("full_agent_state.json")
+    agent.export_state("full_agent_state.pkl", format="pickle")
 
     # Export subagent state
     print("Exporting subagent state...")
     subagent.export_state("subagent_state.json")
 
     print("\nState files created:")
-    print("  - full_agent_state.json")
-    print("  - full_agent_state_context.json")
+    print("  - full_agent_state.pkl (state and context)")
     print("  - subagent_state.json")
 
     # Show what was saved
-    import json
-    with open("full_agent_state.json", 'r') as f:
-        state = json.load(f)
+    import pickle
+    with open("full_agent_state.pkl", 'rb') as f:
+        state = pickle.load(f)
 
     print("\nAgent state summary:")
     print(f"  Model: {state['model_name']}")
@@ -242,7 +267,8 @@ def example_complete_workflow():
     agent = ReactAgent(
         model_name="local-model",
         base_url="http://localhost:1234/v1",
-        api_key="not-needed"
+        api_key="not-needed",
+        http_client=HTTP_CLIENT
     )
 
     # Phase 1: Research
@@ -3,6 +3,9 @@
 import os
 from react_agent import ReactAgent
 
+from _shared import HTTP_CLIENT, shared_agent
+
+
 # Example 1: Basic agent with local model
 def example_basic_agent():
     """Create a basic agent and run a simple task."""
@@ -11,12 +14,7 @@ def example_basic_agent():
     print("=" * 60)
 
     # Create agent pointing to local model
-    agent = ReactAgent(
-        model_name="local-model",
-        base_url="http://localhost:1234/v1",
-        api_key="not-needed",
-        max_tokens=4096
-    )
+    agent = shared_agent(max_tokens=4096)
 
     # Run a simple task
     result = agent.run("List all Python files in the current directory")
@@ -38,11 +36,7 @@ def example_using_tools():
     print("Example 2: Using Built-in Tools")
     print("=" * 60)
 
-    agent = ReactAgent(
-        model_name="local-model",
-        base_url="http://localhost:1234/v1",
-        api_key="not-needed"
-    )
+    agent = shared_agent()
 
     # Task that requires multiple tools
     task = """
@@ -62,12 +56,7 @@ def example_context_management():
     print("Example 3: Context Window Management")
     print("=" * 60)
 
-    agent = ReactAgent(
-        model_name="local-model",
-        base_url="http://localhost:1234/v1",
-        api_key="not-needed",
-        max_tokens=2048  # Smaller context for demonstration
-    )
+    agent = shared_agent(max_tokens=2048)  # Smaller context for demonstration
 
     # Run multiple tasks to fill context
     tasks = [
@@ -107,20 +96,26 @@ def example_custom_tools():
         """
         if n <= 0:
             return "Please provide a positive integer"
-        elif n == 1 or n == 2:
-            return "1"
 
-        a, b = 1, 1
-        for _ in range(n - 2):
-            a, b = b, a + b
+        # Fast doubling: F(2k) = F(k) * (2F(k+1) - F(k)) and
+        # F(2k+1) = F(k)^2 + F(k+1)^2, so only O(log n) steps are needed
+        def fib_pair(k):
+            """Return (F(k), F(k+1))."""
+            if k == 0:
+                return 0, 1
+            a, b = fib_pair(k >> 1)
+            c = a * ((b << 1) - a)
+            d = a * a + b * b
+            return (d, c + d) if k & 1 else (c, d)
 
-        return str(b)
+        return str(fib_pair(n)[0])
 
     # Create agent and add custom tool
     agent = ReactAgent(
         model_name="local-model",
         base_url="http://localhost:1234/v1",
-        api_key="not-needed"
+        api_key="not-needed",
+        http_client=HTTP_CLIENT
     )
 
     agent.add_tool(calculate_fibonacci)
@@ -137,11 +132,7 @@ def example_export_state():
     print("Example 5: Exporting Agent State")
     print("=" * 60)
 
-    agent = ReactAgent(
-        model_name="local-model",
-        base_url="http://localhost:1234/v1",
-        api_key="not-needed"
-    )
+    agent = shared_agent()
 
     # Run some tasks
     agent.run("List files in current directory")
@@ -1,7 +1,31 @@
 """Example demonstrating subagent usage."""
 
+import sys
+import asyncio
+
 from react_agent import ReactAgent
 
+from _shared import HTTP_CLIENT
+
+
+async def run_subagents_concurrently(jobs, max_concurrency=10):
+    """Run independent (subagent, task) pairs concurrently.
+
+    Args:
+        jobs: List of (subagent, task) tuples with no data dependencies
+        max_concurrency: Maximum number of subagents running at once
+
+    Returns:
+        List of SubagentResult, in the same order as jobs
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(subagent, task):
+        async with semaphore:
+            return await subagent.arun(task)
+
+    return await asyncio.gather(*(run_one(subagent, task) for subagent, task in jobs))
+
 
 def example_basic_subagent():
     """Create and use a basic subagent."""
@@ -13,7 +37,8 @@ def example_basic_subagent():
     agent = ReactAgent(
         model_name="local-model",
         base_url="http://localhost:1234/v1",
-        api_key="not-needed"
+        api_key="not-needed",
+        http_client=HTTP_CLIENT
     )
 
     # Create a specialized subagent for code analysis
@@ -54,7 +79,8 @@ def example_multiple_subagents():
     agent = ReactAgent(
         model_name="local-model",
         base_url="http://localhost:1234/v1",
-        api_key="not-needed"
+        api_key="not-needed",
+        http_client=HTTP_CLIENT
     )
 
     # Create specialized subagents
@@ -76,21 +102,18 @@ def example_multiple_subagents():
         ),
     }
 
-    # Use different subagents for different tasks
+    # The tasks are independent, so run the subagents concurrently
     print("\n1. File Manager: Organizing project files")
-    file_result = subagents["file_manager"].run(
-        "List all Python files and organize them by subdirectory"
-    )
-
-    print("\n2. Data Analyzer: Analyzing code statistics")
-    data_result = subagents["data_analyzer"].run(
-        "Analyze the size and line count statistics of Python files"
-    )
-
-    print("\n3. Documentation Writer: Creating README")
-    doc_result = subagents["documentation_writer"].run(
-        "Review the project structure and suggest improvements to README.md"
-    )
+    print("2. Data Analyzer: Analyzing code statistics")
+    print("3. Documentation Writer: Creating README")
+    file_result, data_result, doc_result = asyncio.run(run_subagents_concurrently([
+        (subagents["file_manager"],
+         "List all Python files and organize them by subdirectory"),
+        (subagents["data_analyzer"],
+         "Analyze the size and line count statistics of Python files"),
+        (subagents["documentation_writer"],
+         "Review the project structure and suggest improvements to README.md"),
+    ]))
 
     # Show summary of all subagents
     print("\n" + "=" * 60)
@@ -112,7 +135,8 @@ def example_subagent_context_management():
     agent = ReactAgent(
         model_name="local-model",
         base_url="http://localhost:1234/v1",
-        api_key="not-needed"
+        api_key="not-needed",
+        http_client=HTTP_CLIENT
     )
 
     # Create subagent with smaller context window
@@ -157,7 +181,8 @@ def example_subagent_delegation():
     agent = ReactAgent(
         model_name="local-model",
         base_url="http://localhost:1234/v1",
-        api_key="not-needed"
+        api_key="not-needed",
+        http_client=HTTP_CLIENT
     )
 
     # Create specialized subagents
@@ -188,15 +213,17 @@ def example_subagent_delegation():
     )
 
     print("\nStep 3: Reporting phase")
-    report_result = reporter.run(
-        f"Create a summary report from this analysis: {analysis_result.result}"
-    )
 
-    # Show final report
+    # Show final report, streaming it as it is produced
     print("\n" + "=" * 60)
     print("Final Report:")
     print("=" * 60)
-    print(report_result.result)
+    for chunk in reporter.run_stream(
+        f"Create a summary report from this analysis: {analysis_result.result}"
+    ):
+        sys.stdout.write(chunk)
+    sys.stdout.write("\n")
+    sys.stdout.flush()
 
     # Show token usage across all subagents
     print("\n" + "=" * 60)
@@ -10,26 +10,55 @@ This package provides a comprehensive AI agent implementation with:
 - Token tracking and context window management
 """
 
-from .agent import ReactAgent
-from .subagent import Subagent, SubagentResult
-from .context_manager import (
-    ContextManager,
-    MessageRole,
-    CompactionStrategy
-)
-from .token_tracker import TokenTracker, TokenUsage
-from .mcp_client import MCPClient, MCPServerConfig, create_simple_tool
-from .tools import (
-    read_file,
-    write_file,
-    list_directory,
-    glob_search,
-    grep_search,
-    run_bash_command,
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .agent import ReactAgent
+    from .subagent import Subagent, SubagentResult
+    from .context_manager import (
+        ContextManager,
+        MessageRole,
+        CompactionStrategy
+    )
+    from .token_tracker import TokenTracker, TokenUsage
+    from .mcp_client import MCPClient, MCPServerConfig, create_simple_tool
+    from .tools import (
+        read_file,
+        write_file,
+        list_directory,
+        glob_search,
+        grep_search,
+        grep_search_multi,
+        run_bash_command,
+    )
 
 __version__ = "0.1.0"
 
+# Public names and the submodules defining them. They are imported on first
+# access (PEP 562), so `import react_agent` does not load LangChain until a
+# symbol that needs it is used.
+_LAZY_IMPORTS = {
+    "ReactAgent": ".agent",
+    "Subagent": ".subagent",
+    "SubagentResult": ".subagent",
+    "ContextManager": ".context_manager",
+    "MessageRole": ".context_manager",
+    "CompactionStrategy": ".context_manager",
+    "TokenTracker": ".token_tracker",
+    "TokenUsage": ".token_tracker",
+    "MCPClient": ".mcp_client",
+    "MCPServerConfig": ".mcp_client",
+    "create_simple_tool": ".mcp_client",
+    "read_file": ".tools",
+    "write_file": ".tools",
+    "list_directory": ".tools",
+    "glob_search": ".tools",
+    "grep_search": ".tools",
+    "grep_search_multi": ".tools",
+    "run_bash_command": ".tools",
+}
+
 __all__ = [
     # Main agent
     "ReactAgent",
@@ -58,5 +87,20 @@ __all__ = [
     "list_directory",
     "glob_search",
     "grep_search",
+    "grep_search_multi",
     "run_bash_command",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,6 +2,7 @@
 
 from typing import List, Dict, Any, Optional, Union
 import os
+import pickle
 import logging
 from datetime import datetime
 
@@ -13,14 +14,8 @@ from .context_manager import ContextManager, MessageRole, CompactionStrategy
 from .token_tracker import TokenTracker
 from .mcp_client import MCPClient
 from .subagent import Subagent
-from .tools import (
-    read_file,
-    write_file,
-    list_directory,
-    glob_search,
-    grep_search,
-    run_bash_command,
-)
+from .utils import write_json
+from .tools import BUILTIN_TOOLS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -49,6 +44,8 @@ class ReactAgent:
         max_iterations: int = 15,
         enable_langsmith: bool = False,
         system_prompt: Optional[str] = None,
+        compaction_strategy: Optional[CompactionStrategy] = None,
+        http_client: Optional[Any] = None,
     ):
         """Initialize the ReactAgent.
 
@@ -61,6 +58,10 @@ class ReactAgent:
             max_iterations: Maximum ReAct iterations
             enable_langsmith: Enable LangSmith tracing
             system_prompt: Custom system prompt (optional)
+            compaction_strategy: Context compaction strategy (optional)
+            http_client: Shared ``httpx.Client`` for API requests (optional).
+                Reusing one pooled client across agents keeps connections
+                alive between requests.
         """
         self.model_name = model_name
         self.max_iterations = max_iterations
@@ -79,22 +80,25 @@ class ReactAgent:
             llm_kwargs["base_url"] = base_url
         if api_key:
             llm_kwargs["api_key"] = api_key
+        if http_client is not None:
+            llm_kwargs["http_client"] = http_client
 
         self.llm = ChatOpenAI(**llm_kwargs)
 
         # Initialize context and token management
+        self.token_tracker = TokenTracker(
+            model_name=model_name,
+            max_tokens=max_tokens
+        )
+
         self.context_manager = ContextManager(
             max_tokens=max_tokens,
-            compaction_strategy=CompactionStrategy(
+            compaction_strategy=compaction_strategy or CompactionStrategy(
                 keep_first_n=2,
                 keep_last_n=10,
                 summarize_middle=True
-            )
-        )
-
-        self.token_tracker = TokenTracker(
-            model_name=model_name,
-            max_tokens=max_tokens
+            ),
+            token_tracker=self.token_tracker
         )
 
         # Initialize tools
@@ -145,14 +149,7 @@ When you have enough information to answer the question, provide your final answ
         Returns:
             List of built-in tools
         """
-        return [
-            read_file,
-            write_file,
-            list_directory,
-            glob_search,
-            grep_search,
-            run_bash_command,
-        ]
+        return list(BUILTIN_TOOLS)
 
     def _get_agent_graph(self):
         """Get or create the agent graph.
@@ -188,12 +185,14 @@ When you have enough information to answer the question, provide your final answ
         self.context_manager.add_message(MessageRole.USER, task)
 
         # Check if context needs compaction
-        messages = self.context_manager.get_messages()
-        if self.token_tracker.is_near_limit(messages, threshold=0.7):
+        if self.context_manager.needs_compaction(self.token_tracker, threshold=0.7):
             logger.info("Context near limit, performing compaction...")
             tokens_saved = self.context_manager.compact(self.token_tracker)
             logger.info(f"Compaction saved {tokens_saved} tokens")
 
+        # Running total kept by the context manager, no re-encoding
+        prompt_tokens = self.context_manager.current_tokens(self.token_tracker)
+
         try:
             # Get agent graph
             agent = self._get_agent_graph()
@@ -204,21 +203,12 @@ When you have enough information to answer the question, provide your final answ
                 **kwargs
             )
 
-            # Extract response from the last message
-            # LangGraph returns messages in the state
-            response_messages = result.get("messages", [])
-            if response_messages:
-                # Get the last AI message
-                last_message = response_messages[-1]
-                response = last_message.content if hasattr(last_message, 'content') else str(last_message)
-            else:
-                response = str(result)
+            response = self._extract_response(result)
 
             # Add response to context
             self.context_manager.add_message(MessageRole.ASSISTANT, response)
 
             # Track tokens (approximation)
-            prompt_tokens = self.token_tracker.count_messages_tokens(messages)
             completion_tokens = self.token_tracker.count_tokens(response)
             self.token_tracker.record_usage(prompt_tokens, completion_tokens, context=task)
 
@@ -230,6 +220,90 @@ When you have enough information to answer the question, provide your final answ
             self.context_manager.add_message(MessageRole.ASSISTANT, error_msg)
             return error_msg
 
+    def run_batch(self, tasks: List[str], max_concurrency: Optional[int] = None, **kwargs) -> List[str]:
+        """Run several independent tasks in one batched call.
+
+        The tasks are submitted together through the agent graph's ``batch``,
+        so their LLM requests run concurrently instead of one after another.
+        Each task sees only the system prompt, not the other tasks; results
+        are added to the context in task order.
+
+        Args:
+            tasks: Task descriptions
+            max_concurrency: Maximum number of tasks in flight (default: no limit)
+            **kwargs: Additional arguments for the agent graph
+
+        Returns:
+            Agent's responses, in the same order as tasks
+        """
+        if not tasks:
+            return []
+
+        # Check if context needs compaction
+        if self.context_manager.needs_compaction(self.token_tracker, threshold=0.7):
+            logger.info("Context near limit, performing compaction...")
+            tokens_saved = self.context_manager.compact(self.token_tracker)
+            logger.info(f"Compaction saved {tokens_saved} tokens")
+
+        # Every task is counted against the context as it was before the batch
+        context_tokens = self.context_manager.current_tokens(self.token_tracker)
+
+        config = {"max_concurrency": max_concurrency} if max_concurrency else None
+
+        try:
+            agent = self._get_agent_graph()
+            results = agent.batch(
+                [{"messages": [{"role": "user", "content": task}]} for task in tasks],
+                config=config,
+                return_exceptions=True,
+                **kwargs
+            )
+        except Exception as e:
+            results = [e] * len(tasks)
+
+        responses = []
+        for task, result in zip(tasks, results):
+            self.context_manager.add_message(MessageRole.USER, task)
+
+            if isinstance(result, Exception):
+                error_msg = f"Error executing task: {str(result)}"
+                logger.error(error_msg)
+                self.context_manager.add_message(MessageRole.ASSISTANT, error_msg)
+                responses.append(error_msg)
+                continue
+
+            response = self._extract_response(result)
+            self.context_manager.add_message(MessageRole.ASSISTANT, response)
+
+            # Track tokens (approximation)
+            prompt_tokens = context_tokens + self.token_tracker.count_message_tokens(
+                {"role": MessageRole.USER.value, "content": task}
+            )
+            completion_tokens = self.token_tracker.count_tokens(response)
+            self.token_tracker.record_usage(prompt_tokens, completion_tokens, context=task)
+
+            responses.append(response)
+
+        return responses
+
+    def _extract_response(self, result: Any) -> str:
+        """Extract the response text from an agent graph result.
+
+        Args:
+            result: State returned by the agent graph
+
+        Returns:
+            Response text
+        """
+        # LangGraph returns messages in the state
+        response_messages = result.get("messages", [])
+        if response_messages:
+            # Get the last AI message
+            last_message = response_messages[-1]
+            return last_message.content if hasattr(last_message, 'content') else str(last_message)
+
+        return str(result)
+
     def add_tool(self, tool: BaseTool):
         """Add a custom tool to the agent.
 
@@ -343,29 +417,34 @@ When you have enough information to answer the question, provide your final answ
         self.token_tracker.reset()
         logger.info("Agent reset")
 
-    def export_state(self, filepath: str):
+    def export_state(self, filepath: str, format: str = "json"):
         """Export agent state to a file.
 
         Args:
             filepath: Path to save state
+            format: Serialization format, "json" or "pickle" (faster to
+                write and load, but Python-only)
         """
-        # Export context
-        context_file = filepath.replace(".json", "_context.json")
-        self.context_manager.export_context(context_file)
+        if format not in ("json", "pickle"):
+            raise ValueError(f"Unsupported export format: {format}")
 
-        # Export full state
-        import json
+        # Everything, including the full context, goes into one file so the
+        # state is serialized and written in a single pass
         state = {
             "model_name": self.model_name,
             "system_prompt": self.system_prompt,
             "token_usage": self.token_tracker.get_total_usage(),
             "context_state": self.context_manager.get_state(),
+            "context": self.context_manager.to_dict(),
             "subagents": list(self.subagents.keys()),
             "mcp_servers": self.mcp_client.list_servers(),
             "timestamp": datetime.now().isoformat()
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(state, f, indent=2)
+        if format == "pickle":
+            with open(filepath, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            write_json(state, filepath)
 
         logger.info(f"State exported to {filepath}")
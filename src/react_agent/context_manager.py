@@ -1,9 +1,21 @@
 """Context window management and compaction for the ReactAgent."""
 
-from typing import List, Dict, Optional, Any
+from typing import Iterator, List, Dict, Optional, Any, Tuple, Union
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
-import json
+from itertools import chain
+import pickle
+import re
+import sys
+
+from .token_tracker import _CLEARLY_UNDER, estimate_message_tokens
+from .utils import read_json, write_json
+
+try:
+    import ijson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    ijson = None
 
 
 class MessageRole(str, Enum):
@@ -14,6 +26,65 @@ class MessageRole(str, Enum):
     TOOL = "tool"
 
 
+# Header of the system message that replaces compacted messages
+_SUMMARY_HEADER = re.compile(r"\[Context Summary - (\d+) messages compressed\]\n?")
+
+
+# Role strings, for hot paths that compare or pass roles without going
+# through the enum
+ROLE_SYSTEM = MessageRole.SYSTEM.value
+ROLE_USER = MessageRole.USER.value
+ROLE_ASSISTANT = MessageRole.ASSISTANT.value
+ROLE_TOOL = MessageRole.TOOL.value
+
+_ROLE_VALUES = {role: role.value for role in MessageRole}
+
+
+def _format_user(msg: Dict[str, Any], content: str) -> str:
+    return f"User asked: {content}"
+
+
+def _format_assistant(msg: Dict[str, Any], content: str) -> str:
+    if "tool_calls" in msg:
+        tools = ", ".join(tc.get("function", {}).get("name", "unknown") for tc in msg["tool_calls"])
+        return f"Assistant used tools: {tools}"
+    return f"Assistant: {content}"
+
+
+def _format_tool(msg: Dict[str, Any], content: str) -> str:
+    return f"Tool {msg.get('name', 'unknown')} executed"
+
+
+def _format_unknown(msg: Dict[str, Any], content: str) -> None:
+    return None  # Other roles (e.g. system) are left out of summaries
+
+
+# Summary line formatter for each message role
+_SUMMARY_FORMATTERS = {
+    ROLE_USER: _format_user,
+    ROLE_ASSISTANT: _format_assistant,
+    ROLE_TOOL: _format_tool,
+}
+
+
+# Layout of ContextManager.get_state_summary
+_STATE_SUMMARY_TEMPLATE = """
+Context Window State
+===================
+Current Messages:        {message_count}
+Total Messages Seen:     {total_messages_seen}
+Current Tokens:          {current_tokens:,} / {max_tokens:,}
+Usage Percentage:        {usage_pct:.2f}%
+Compactions Performed:   {compaction_count}
+Tokens Saved:            {tokens_saved:,}
+
+Compaction Strategy:
+  Keep First N:          {keep_first_n}
+  Keep Last N:           {keep_last_n}
+  Summarize Middle:      {summarize_middle}
+""".strip()
+
+
 @dataclass
 class CompactionStrategy:
     """Configuration for context compaction."""
@@ -30,6 +101,32 @@ class CompactionStrategy:
     # Maximum tokens for summary
     summary_max_tokens: int = 500
 
+    # Every N compactions, trim the summary carried over from earlier
+    # compactions to its most recent summary_max_tokens, bounding its
+    # growth (0 disables)
+    summary_trim_every: int = 10
+
+    @classmethod
+    def attention_sink(cls, sink_messages: int = 4, window_messages: int = 10) -> "CompactionStrategy":
+        """Create a StreamingLLM-style "attention sink" strategy.
+
+        The first messages (system prompt and opening turns) are always kept
+        verbatim together with a sliding window of the most recent ones; the
+        middle is dropped without summarizing, so compaction is just slicing.
+
+        Args:
+            sink_messages: Number of leading messages to always keep
+            window_messages: Number of most recent messages to keep
+
+        Returns:
+            CompactionStrategy instance
+        """
+        return cls(
+            keep_first_n=sink_messages,
+            keep_last_n=window_messages,
+            summarize_middle=False
+        )
+
 
 class ContextManager:
     """Manages conversation context and performs compaction when needed."""
@@ -37,17 +134,38 @@ class ContextManager:
     def __init__(
         self,
         max_tokens: int = 4096,
-        compaction_strategy: Optional[CompactionStrategy] = None
+        compaction_strategy: Optional[CompactionStrategy] = None,
+        token_tracker: Optional[Any] = None
     ):
         """Initialize the context manager.
 
         Args:
             max_tokens: Maximum tokens allowed in context
             compaction_strategy: Strategy for context compaction
+            token_tracker: TokenTracker used to count message tokens as
+                they are added (optional, see ``attach_tracker``)
         """
         self.max_tokens = max_tokens
-        self.messages: List[Dict[str, Any]] = []
         self.compaction_strategy = compaction_strategy or CompactionStrategy()
+        self.token_tracker = token_tracker
+
+        # Messages are stored pre-split into the spans compaction works on:
+        # the first keep_first_n, the compactable middle, and the last
+        # keep_last_n, so compaction never has to slice the whole history
+        self._head: List[Dict[str, Any]] = []
+        self._middle: deque = deque()
+        self._tail: deque = deque(maxlen=self.compaction_strategy.keep_last_n)
+        # Token count of each message (None until counted), kept in spans
+        # parallel to the message spans so the message dicts stay untouched
+        self._head_tokens: List[Optional[int]] = []
+        self._middle_tokens: deque = deque()
+        self._tail_tokens: deque = deque(maxlen=self.compaction_strategy.keep_last_n)
+        # Running sum of estimate_message_tokens over all messages
+        self._estimate_total = 0
+        # Running sum of the cached counts, and how many messages have no
+        # cached count yet, so current_tokens is O(1)
+        self._tok_total = 0
+        self._uncounted = 0
         self.compaction_count = 0
         self.metadata: Dict[str, Any] = {
             "total_messages": 0,
@@ -57,7 +175,7 @@ class ContextManager:
 
     def add_message(
         self,
-        role: MessageRole,
+        role: Union[MessageRole, str],
         content: str,
         name: Optional[str] = None,
         tool_calls: Optional[List[Dict]] = None,
@@ -66,35 +184,208 @@ class ContextManager:
         """Add a message to the context.
 
         Args:
-            role: Role of the message sender
+            role: Role of the message sender (a MessageRole or its string value)
             content: Content of the message
             name: Optional name (for tool messages)
             tool_calls: Optional tool calls (for assistant messages)
             tool_call_id: Optional tool call ID (for tool messages)
         """
-        message = {"role": role.value, "content": content}
+        message = {"role": _ROLE_VALUES.get(role, role), "content": content}
 
         if name:
-            message["name"] = name
+            # Names come from the small set of tool names, so one shared
+            # object per name is kept; contents are never interned, since
+            # interned strings are immortal on Python 3.12+
+            message["name"] = sys.intern(name) if type(name) is str else name
         if tool_calls:
             message["tool_calls"] = tool_calls
         if tool_call_id:
             message["tool_call_id"] = tool_call_id
 
-        self.messages.append(message)
+        # Count once now; later checks sum the cached counts
+        tokens = None
+        if self.token_tracker is not None:
+            tokens = self.token_tracker.count_message_tokens(message)
+
+        self._resplit_if_stale()
+        self._append(message, tokens)
         self.metadata["total_messages"] += 1
 
+    def _resplit_if_stale(self):
+        """Re-split the spans if compaction_strategy changed since the messages were added.
+
+        Otherwise a larger keep_first_n would place the next message in the
+        head, ahead of older middle and tail messages.
+        """
+        keep_first_n = self.compaction_strategy.keep_first_n
+        head = len(self._head)
+        if (
+            self._tail.maxlen != self.compaction_strategy.keep_last_n
+            or head > keep_first_n
+            or (head < keep_first_n and (self._middle or self._tail))
+        ):
+            self._reset(self.messages, list(chain(self._head_tokens, self._middle_tokens, self._tail_tokens)))
+
+    def _append(self, message: Dict[str, Any], tokens: Optional[int] = None):
+        """Append a message to the head, or to the tail moving its oldest message into the middle."""
+        self._estimate_total += estimate_message_tokens(message)
+        if tokens is None:
+            self._uncounted += 1
+        else:
+            self._tok_total += tokens
+        if len(self._head) < self.compaction_strategy.keep_first_n:
+            self._head.append(message)
+            self._head_tokens.append(tokens)
+        elif self._tail.maxlen == 0:
+            self._middle.append(message)
+            self._middle_tokens.append(tokens)
+        else:
+            if len(self._tail) == self._tail.maxlen:
+                self._middle.append(self._tail.popleft())
+                self._middle_tokens.append(self._tail_tokens.popleft())
+            self._tail.append(message)
+            self._tail_tokens.append(tokens)
+
+    def _reset(self, messages, token_counts=None):
+        """Replace the stored messages, re-splitting them for the current strategy.
+
+        Args:
+            messages: Messages in order
+            token_counts: Cached token count of each message (None entries
+                or no list at all for messages not counted yet)
+        """
+        keep_last_n = self.compaction_strategy.keep_last_n
+        self._head = []
+        self._middle = deque()
+        self._tail = deque(maxlen=keep_last_n)
+        self._head_tokens = []
+        self._middle_tokens = deque()
+        self._tail_tokens = deque(maxlen=keep_last_n)
+        self._estimate_total = 0
+        self._tok_total = 0
+        self._uncounted = 0
+        if token_counts is None:
+            for message in messages:
+                self._append(message)
+        else:
+            for message, tokens in zip(messages, token_counts):
+                self._append(message, tokens)
+
+    def _set_token_counts(self, token_counts: List[int]):
+        """Store a token count for every message, in order."""
+        head, middle = len(self._head), len(self._middle)
+        self._head_tokens = token_counts[:head]
+        self._middle_tokens = deque(token_counts[head:head + middle])
+        self._tail_tokens = deque(token_counts[head + middle:], maxlen=self._tail.maxlen)
+
+    @property
+    def messages(self) -> Tuple[Dict[str, Any], ...]:
+        """All messages in the context, in order, as a read-only tuple.
+
+        This used to be the stored list itself. Messages are now kept in
+        separate spans with running totals, so in-place edits such as
+        ``messages.append(...)`` are not possible and raise instead of
+        being silently lost. Add messages with ``add_message`` or assign
+        a new sequence to replace them all.
+        """
+        return tuple(chain(self._head, self._middle, self._tail))
+
+    @messages.setter
+    def messages(self, messages: List[Dict[str, Any]]):
+        self._reset(messages)
+
+    def __len__(self) -> int:
+        return len(self._head) + len(self._middle) + len(self._tail)
+
+    def attach_tracker(self, token_tracker):
+        """Set the TokenTracker used to count message tokens.
+
+        Args:
+            token_tracker: TokenTracker instance
+        """
+        self.token_tracker = token_tracker
+        token_counts = token_tracker.count_message_tokens_batch(self.messages)
+        self._set_token_counts(token_counts)
+        self._tok_total = sum(token_counts)
+        self._uncounted = 0
+
+    def current_tokens(self, token_tracker=None) -> int:
+        """Get the token count of the current context from the running total.
+
+        Args:
+            token_tracker: TokenTracker for messages without a cached count
+                (default: the attached tracker)
+
+        Returns:
+            Current token count
+        """
+        token_tracker = token_tracker or self.token_tracker
+        if token_tracker is None:
+            raise ValueError("No token tracker attached to the context manager")
+
+        # Count any messages added without a tracker in one batch
+        if self._uncounted:
+            messages = self.messages
+            token_counts = list(chain(self._head_tokens, self._middle_tokens, self._tail_tokens))
+            missing = [i for i, tokens in enumerate(token_counts) if tokens is None]
+            for i, tokens in zip(missing, token_tracker.count_message_tokens_batch([messages[i] for i in missing])):
+                token_counts[i] = tokens
+                self._tok_total += tokens
+            self._set_token_counts(token_counts)
+            self._uncounted = 0
+
+        return self._tok_total + 2  # Every reply is primed with <|start|>assistant
+
+    def needs_compaction(self, token_tracker=None, threshold: float = 0.7) -> bool:
+        """Check if the context is at or over a fraction of max_tokens.
+
+        A character-based estimate settles the check only when it is
+        clearly under the threshold; otherwise the context is counted
+        exactly with ``current_tokens``, so compaction (which loses
+        information) never runs on an estimate alone.
+
+        Args:
+            token_tracker: TokenTracker for the exact count (default: the attached tracker)
+            threshold: Fraction of max_tokens that triggers compaction (0.0-1.0)
+
+        Returns:
+            True if the context should be compacted
+        """
+        limit = threshold * self.max_tokens
+        if self._estimate_total + 2 < limit * _CLEARLY_UNDER:
+            return False
+        return self.current_tokens(token_tracker) >= limit
+
+    def view_messages(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the stored messages without building a list.
+
+        The yielded dictionaries are the context's own; treat them as
+        read-only, and don't add or compact messages mid-iteration.
+
+        Returns:
+            Iterator over the message dictionaries, in order
+        """
+        return chain(self._head, self._middle, self._tail)
+
     def get_messages(self) -> List[Dict[str, Any]]:
         """Get all messages in the context.
 
         Returns:
             List of message dictionaries
         """
-        return self.messages.copy()
+        return list(chain(self._head, self._middle, self._tail))
 
     def clear(self):
         """Clear all messages from context."""
-        self.messages.clear()
+        self._head.clear()
+        self._middle.clear()
+        self._tail.clear()
+        self._head_tokens.clear()
+        self._middle_tokens.clear()
+        self._tail_tokens.clear()
+        self._estimate_total = 0
+        self._tok_total = 0
+        self._uncounted = 0
 
     def compact(self, token_tracker) -> int:
         """Compact the context window by summarizing or removing old messages.
@@ -105,40 +396,66 @@ class ContextManager:
         Returns:
             Number of tokens saved
         """
-        if len(self.messages) <= (
-            self.compaction_strategy.keep_first_n + self.compaction_strategy.keep_last_n
-        ):
-            return 0  # Not enough messages to compact
+        self._resplit_if_stale()
+
+        # The middle span is already isolated from the kept head and tail
+        middle_messages = list(self._middle)
 
-        original_tokens = token_tracker.count_messages_tokens(self.messages)
+        # A previous compaction leaves its summary first in the middle; only
+        # the messages that aged out since then need summarizing
+        prior_summary = None
+        prior_match = None
+        if middle_messages and middle_messages[0]["role"] == ROLE_SYSTEM:
+            prior_match = _SUMMARY_HEADER.match(middle_messages[0]["content"])
+            if prior_match:
+                prior_summary = middle_messages[0]
+                middle_messages = middle_messages[1:]
 
-        # Keep first N messages (system prompt, etc.)
-        first_messages = self.messages[:self.compaction_strategy.keep_first_n]
+        if not middle_messages:
+            return 0  # Nothing new to compact
 
-        # Keep last N messages (recent context)
-        last_messages = self.messages[-self.compaction_strategy.keep_last_n:]
+        # Count any uncounted messages before the middle is replaced
+        self.current_tokens(token_tracker)
 
-        # Get middle messages to summarize
-        middle_messages = self.messages[
-            self.compaction_strategy.keep_first_n:-self.compaction_strategy.keep_last_n
-        ]
+        removed_messages = middle_messages if prior_summary is None else [prior_summary] + middle_messages
 
         # Create summary of middle messages
-        if self.compaction_strategy.summarize_middle and middle_messages:
+        if self.compaction_strategy.summarize_middle:
             summary = self._summarize_messages(middle_messages)
+            compressed_count = len(middle_messages)
+
+            every = self.compaction_strategy.summary_trim_every
+            if prior_summary is not None:
+                compressed_count += int(prior_match.group(1))
+                prior_text = prior_summary["content"][prior_match.end():]
+                if every > 0 and (self.compaction_count + 1) % every == 0:
+                    prior_text = self._trim_summary(prior_text, token_tracker)
+                summary = f"{prior_text}\n{summary}" if prior_text else summary
+
             summary_message = {
-                "role": MessageRole.SYSTEM.value,
-                "content": f"[Context Summary - {len(middle_messages)} messages compressed]\n{summary}"
+                "role": ROLE_SYSTEM,
+                "content": f"[Context Summary - {compressed_count} messages compressed]\n{summary}"
             }
 
-            # Reconstruct messages with summary
-            self.messages = first_messages + [summary_message] + last_messages
+            # Replace the middle with the summary
+            added_messages = [summary_message]
+            added_tokens = [token_tracker.count_message_tokens(summary_message)]
         else:
             # Just keep first and last
-            self.messages = first_messages + last_messages
+            added_messages = []
+            added_tokens = []
+
+        self._estimate_total += (
+            sum(map(estimate_message_tokens, added_messages))
+            - sum(map(estimate_message_tokens, removed_messages))
+        )
 
-        new_tokens = token_tracker.count_messages_tokens(self.messages)
-        tokens_saved = original_tokens - new_tokens
+        # Only the replaced span changes, so compare cached counts for it;
+        # only the new summary message has to be counted
+        tokens_saved = sum(self._middle_tokens) - sum(added_tokens)
+        self._tok_total -= tokens_saved
+        self._middle = deque(added_messages)
+        self._middle_tokens = deque(added_tokens)
 
         self.compaction_count += 1
         self.metadata["compactions"] += 1
@@ -146,6 +463,26 @@ class ContextManager:
 
         return tokens_saved
 
+    def _trim_summary(self, text: str, token_tracker) -> str:
+        """Keep the most recent whole lines of a summary that fit in summary_max_tokens.
+
+        Args:
+            text: Summary lines, oldest first
+            token_tracker: TokenTracker whose encoding measures the summary
+
+        Returns:
+            The trimmed summary
+        """
+        max_tokens = self.compaction_strategy.summary_max_tokens
+        tokens = token_tracker.encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+
+        # Drop the partial line the cut landed in
+        kept = token_tracker.encoding.decode(tokens[-max_tokens:]) if max_tokens > 0 else ""
+        newline = kept.find("\n")
+        return kept[newline + 1:] if newline != -1 else ""
+
     def _summarize_messages(self, messages: List[Dict[str, Any]]) -> str:
         """Create a summary of messages.
 
@@ -155,30 +492,20 @@ class ContextManager:
         Returns:
             Summary string
         """
-        summary_parts = []
+        # One slot per message; roles that aren't summarized leave None
+        summary_parts = [None] * len(messages)
+        formatters = _SUMMARY_FORMATTERS
 
-        for msg in messages:
-            role = msg.get("role", "unknown")
+        for i, msg in enumerate(messages):
             content = msg.get("content", "")
 
             # Truncate long content
             if len(content) > 200:
                 content = content[:200] + "..."
 
-            if role == MessageRole.USER.value:
-                summary_parts.append(f"User asked: {content}")
-            elif role == MessageRole.ASSISTANT.value:
-                if "tool_calls" in msg:
-                    tools = [tc.get("function", {}).get("name", "unknown")
-                            for tc in msg.get("tool_calls", [])]
-                    summary_parts.append(f"Assistant used tools: {', '.join(tools)}")
-                else:
-                    summary_parts.append(f"Assistant: {content}")
-            elif role == MessageRole.TOOL.value:
-                tool_name = msg.get("name", "unknown")
-                summary_parts.append(f"Tool {tool_name} executed")
-
-        return "\n".join(summary_parts)
+            summary_parts[i] = formatters.get(msg.get("role", "unknown"), _format_unknown)(msg, content)
+
+        return "\n".join(filter(None, summary_parts))
 
     def get_state(self) -> Dict[str, Any]:
         """Get current state of the context window.
@@ -187,7 +514,7 @@ class ContextManager:
             Dictionary with context state information
         """
         return {
-            "message_count": len(self.messages),
+            "message_count": len(self),
             "total_messages_seen": self.metadata["total_messages"],
             "compaction_count": self.compaction_count,
             "tokens_saved": self.metadata["tokens_saved"],
@@ -208,42 +535,52 @@ class ContextManager:
         Returns:
             Formatted string with context state
         """
-        state = self.get_state()
-        current_tokens = token_tracker.count_messages_tokens(self.messages)
-        usage_pct = (current_tokens / self.max_tokens) * 100
+        current_tokens = self.current_tokens(token_tracker)
+        strategy = self.compaction_strategy
+
+        return _STATE_SUMMARY_TEMPLATE.format(
+            message_count=len(self),
+            total_messages_seen=self.metadata["total_messages"],
+            current_tokens=current_tokens,
+            max_tokens=self.max_tokens,
+            usage_pct=(current_tokens / self.max_tokens) * 100,
+            compaction_count=self.compaction_count,
+            tokens_saved=self.metadata["tokens_saved"],
+            keep_first_n=strategy.keep_first_n,
+            keep_last_n=strategy.keep_last_n,
+            summarize_middle=strategy.summarize_middle
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the context as a serializable dictionary.
 
-        summary = f"""
-Context Window State
-===================
-Current Messages:        {state['message_count']}
-Total Messages Seen:     {state['total_messages_seen']}
-Current Tokens:          {current_tokens:,} / {state['max_tokens']:,}
-Usage Percentage:        {usage_pct:.2f}%
-Compactions Performed:   {state['compaction_count']}
-Tokens Saved:            {state['tokens_saved']:,}
-
-Compaction Strategy:
-  Keep First N:          {state['compaction_strategy']['keep_first_n']}
-  Keep Last N:           {state['compaction_strategy']['keep_last_n']}
-  Summarize Middle:      {state['compaction_strategy']['summarize_middle']}
-        """.strip()
-
-        return summary
+        Returns:
+            Dictionary with messages, metadata and state
+        """
+        return {
+            "messages": self.get_messages(),
+            "metadata": self.metadata,
+            "state": self.get_state()
+        }
 
-    def export_context(self, filepath: str):
-        """Export context to a JSON file.
+    def export_context(self, filepath: str, format: str = "json", pretty: bool = True):
+        """Export context to a file.
 
         Args:
             filepath: Path to save the context
+            format: Serialization format, "json" or "pickle"
+            pretty: Indent JSON output (default: True)
         """
-        data = {
-            "messages": self.messages,
-            "metadata": self.metadata,
-            "state": self.get_state()
-        }
+        if format not in ("json", "pickle"):
+            raise ValueError(f"Unsupported export format: {format}")
 
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        data = self.to_dict()
+
+        if format == "pickle":
+            with open(filepath, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            write_json(data, filepath, pretty=pretty)
 
     def import_context(self, filepath: str):
         """Import context from a JSON file.
@@ -251,10 +588,50 @@ Compaction Strategy:
         Args:
             filepath: Path to load the context from
         """
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        if ijson is not None:
+            self._import_context_stream(filepath)
+            return
+
+        data = read_json(filepath)
 
         self.messages = data.get("messages", [])
         self.metadata = data.get("metadata", {})
         if "state" in data:
             self.compaction_count = data["state"].get("compaction_count", 0)
+
+    def _import_context_stream(self, filepath: str):
+        """Import context with ijson, building messages as they are parsed.
+
+        The whole parsed document is never held in memory, only the
+        messages themselves. They are collected apart from the live
+        context and swapped in once the file has parsed, so a malformed
+        or truncated file raises without changing the context.
+        """
+        messages = []
+        metadata = {}
+        state = None
+
+        builder = None
+        target = None
+        with open(filepath, 'rb') as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is None:
+                    if event != "start_map" or prefix not in ("messages.item", "metadata", "state"):
+                        continue
+                    builder = ijson.ObjectBuilder()
+                    target = prefix
+
+                builder.event(event, value)
+                if event == "end_map" and prefix == target:
+                    if target == "messages.item":
+                        messages.append(builder.value)
+                    elif target == "metadata":
+                        metadata = builder.value
+                    else:
+                        state = builder.value
+                    builder = None
+
+        self._reset(messages)
+        self.metadata = metadata
+        if state is not None:
+            self.compaction_count = state.get("compaction_count", 0)
@@ -1,10 +1,11 @@
 """MCP (Model Context Protocol) server integration for custom tools."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 import json
 import asyncio
+import inspect
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,8 @@ class MCPClient:
         """Initialize the MCP client."""
         self.servers: Dict[str, MCPServerConfig] = {}
         self.tools: Dict[str, StructuredTool] = {}
+        # Number of tools named "<server>_..." for each server
+        self._tool_counts: Dict[str, int] = {}
 
     def add_server(
         self,
@@ -57,6 +60,8 @@ class MCPClient:
         )
 
         self.servers[name] = config
+        prefix = f"{name}_"
+        self._tool_counts[name] = sum(1 for tool_name in self.tools if tool_name.startswith(prefix))
 
         # Discover and register tools from this server
         try:
@@ -93,6 +98,15 @@ class MCPClient:
             "This is a placeholder for MCP integration."
         )
 
+    def _count_tool(self, tool_name: str, delta: int):
+        """Adjust the tool count of every server whose prefix the tool name has."""
+        index = tool_name.find("_")
+        while index != -1:
+            server_name = tool_name[:index]
+            if server_name in self._tool_counts:
+                self._tool_counts[server_name] += delta
+            index = tool_name.find("_", index + 1)
+
     def get_tools(self) -> List[StructuredTool]:
         """Get all registered tools from MCP servers.
 
@@ -115,16 +129,16 @@ class MCPClient:
             return False
 
         # Remove tools from this server
-        tools_to_remove = [
-            tool_name for tool_name, tool in self.tools.items()
-            if tool_name.startswith(f"{name}_")
-        ]
+        prefix = f"{name}_"
+        tools_to_remove = [tool_name for tool_name in self.tools if tool_name.startswith(prefix)]
 
         for tool_name in tools_to_remove:
+            self._count_tool(tool_name, -1)
             del self.tools[tool_name]
 
         # Remove server
         del self.servers[name]
+        del self._tool_counts[name]
 
         logger.info(f"Removed MCP server: {name}")
         return True
@@ -139,7 +153,7 @@ class MCPClient:
             {
                 "name": name,
                 "url": config.url,
-                "tool_count": len([t for t in self.tools if t.startswith(f"{name}_")])
+                "tool_count": self._tool_counts.get(name, 0)
             }
             for name, config in self.servers.items()
         ]
@@ -169,16 +183,73 @@ class MCPClient:
             args_schema=args_schema
         )
 
+        if name not in self.tools:
+            self._count_tool(name, 1)
         self.tools[name] = tool
         logger.info(f"Created custom tool: {name}")
 
         return tool
 
 
+# Args schemas inferred by create_simple_tool, keyed by _schema_key. Only
+# the schema class is kept, never the function or the tool, and the
+# oldest entry is evicted first when the cache is full.
+_SCHEMA_CACHE_SIZE = 256
+_schema_cache: Dict[Tuple, Any] = {}
+
+
+def _schema_key(name: str, description: str, func: callable) -> Optional[Tuple]:
+    """Get the cache key for the args schema of a function, or None if it can't be cached.
+
+    The key holds the function's code object and each parameter's resolved
+    annotation and default, so two functions whose signatures print the
+    same but use different annotation classes (e.g. two local ``Input``
+    models) get different schemas.
+    """
+    try:
+        signature = inspect.signature(func, eval_str=True)
+        params = tuple(
+            (param.name, param.kind, param.annotation, type(param.default), param.default)
+            for param in signature.parameters.values()
+        )
+        key = (name, description, getattr(func, "__code__", None), params)
+        hash(key)
+    except Exception:
+        return None  # No signature, unresolvable annotations or unhashable defaults
+    return key
+
+
+def _build_simple_tool(name: str, description: str, func: callable) -> StructuredTool:
+    """Build a StructuredTool, reusing the args schema inferred for an identical earlier request.
+
+    Inferring the schema builds a Pydantic model from the function
+    signature; that is the slow part, so it is done once per distinct
+    name, description and signature while every call still gets its own tool.
+    """
+    key = _schema_key(name, description, func)
+
+    schema = _schema_cache.get(key) if key is not None else None
+    tool = StructuredTool.from_function(
+        func=func,
+        name=name,
+        description=description,
+        args_schema=schema
+    )
+
+    if key is not None and schema is None:
+        if len(_schema_cache) >= _SCHEMA_CACHE_SIZE:
+            del _schema_cache[next(iter(_schema_cache))]
+        _schema_cache[key] = tool.args_schema
+    return tool
+
+
 # Example custom tool creation helper
 def create_simple_tool(name: str, description: str, func: callable) -> StructuredTool:
     """Helper function to create a simple custom tool.
 
+    The inferred args schema is cached, so creating the same tool again
+    is cheap; every call returns a new tool instance.
+
     Args:
         name: Name of the tool
         description: Description of the tool
@@ -197,8 +268,4 @@ def create_simple_tool(name: str, description: str, func: callable) -> Structure
             my_tool
         )
     """
-    return StructuredTool.from_function(
-        func=func,
-        name=name,
-        description=description
-    )
+    return _build_simple_tool(name, description, func)
@@ -1,12 +1,15 @@
 """Subagent implementation for delegating specialized tasks."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Generator
 from dataclasses import dataclass, field
 from datetime import datetime
-import json
+from time import perf_counter
+import asyncio
+import sys
 
-from .context_manager import ContextManager, MessageRole, CompactionStrategy
+from .context_manager import ContextManager, MessageRole, CompactionStrategy, ROLE_ASSISTANT, ROLE_USER
 from .token_tracker import TokenTracker
+from .utils import write_json
 
 
 @dataclass
@@ -46,31 +49,34 @@ class Subagent:
             parent_agent: Reference to parent agent (optional)
         """
         self.name = name
-        self.system_prompt = system_prompt
+        # Subagents are often created with the same prompt; interning shares
+        # one string object, so token-count cache lookups match by identity
+        self.system_prompt = sys.intern(system_prompt)
         self.llm = llm
         self.tools = tools or []
         self.max_iterations = max_iterations
         self.parent_agent = parent_agent
 
         # Independent context and token tracking
+        self.token_tracker = TokenTracker(
+            model_name=getattr(llm, 'model_name', 'gpt-3.5-turbo'),
+            max_tokens=max_tokens
+        )
+
         self.context_manager = ContextManager(
             max_tokens=max_tokens,
             compaction_strategy=CompactionStrategy(
                 keep_first_n=1,  # Just the system prompt
                 keep_last_n=5,   # Recent context
                 summarize_middle=True
-            )
-        )
-
-        self.token_tracker = TokenTracker(
-            model_name=getattr(llm, 'model_name', 'gpt-3.5-turbo'),
-            max_tokens=max_tokens
+            ),
+            token_tracker=self.token_tracker
         )
 
         # Initialize context with system prompt
         self.context_manager.add_message(
             MessageRole.SYSTEM,
-            system_prompt
+            self.system_prompt
         )
 
         # Execution metadata
@@ -87,7 +93,31 @@ class Subagent:
         Returns:
             SubagentResult with execution details
         """
-        start_time = datetime.now()
+        steps = self._execute(task)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+    def _execute(self, task: str) -> Generator[str, None, SubagentResult]:
+        """Run a task, yielding each ReAct step, with the bookkeeping shared by run and run_stream.
+
+        Errors are caught and returned as an unsuccessful result. The tokens
+        the task used are added to total_tokens_used however it ends, even
+        if a streaming caller stops early.
+
+        Args:
+            task: Task description for the subagent
+
+        Yields:
+            Output of each ReAct iteration
+
+        Returns:
+            SubagentResult with execution details
+        """
+        start_time = perf_counter()
+        tokens_before = self.token_tracker.get_total_usage()["total_tokens"]
         self.execution_count += 1
 
         # Add user task to context
@@ -95,23 +125,20 @@ class Subagent:
 
         try:
             # Execute ReAct loop
-            result = self._react_loop(task)
+            final_answer = yield from self._iter_react_loop(task)
+            result = final_answer or "Max iterations reached without final answer"
 
             # Generate summary
             summary = self._generate_summary()
 
             # Calculate execution time
-            execution_time = (datetime.now() - start_time).total_seconds()
-
-            # Get token usage
-            token_usage = self.token_tracker.get_total_usage()
-            self.total_tokens_used += token_usage["total_tokens"]
+            execution_time = perf_counter() - start_time
 
             return SubagentResult(
                 success=True,
                 result=result,
                 summary=summary,
-                token_usage=token_usage,
+                token_usage=self.token_tracker.get_total_usage(),
                 execution_time=execution_time,
                 metadata={
                     "iterations": self.execution_count,
@@ -120,7 +147,7 @@ class Subagent:
             )
 
         except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = perf_counter() - start_time
 
             return SubagentResult(
                 success=False,
@@ -131,14 +158,78 @@ class Subagent:
                 metadata={"error": str(e)}
             )
 
-    def _react_loop(self, task: str) -> str:
-        """Execute the ReAct (Reasoning and Acting) loop.
+        finally:
+            self.total_tokens_used += self.token_tracker.get_total_usage()["total_tokens"] - tokens_before
+
+    async def arun(self, task: str) -> SubagentResult:
+        """Execute a task without blocking the event loop.
+
+        The run happens in a worker thread, so independent subagents can be
+        awaited together (e.g. with ``asyncio.gather``) and their LLM calls
+        overlap. A single subagent should not run concurrent tasks, since
+        they would share its context.
+
+        Args:
+            task: Task description for the subagent
+
+        Returns:
+            SubagentResult with execution details
+        """
+        return await asyncio.to_thread(self.run, task)
+
+    async def arun_stream(self, task: str) -> AsyncIterator[str]:
+        """Execute a task, yielding each ReAct step's output as it is produced.
+
+        Callers can start consuming output before the whole run finishes.
+        The steps run in a worker thread, so the event loop is not blocked.
+
+        Args:
+            task: Task description for the subagent
+
+        Yields:
+            Output of each ReAct iteration; the last one is the final answer
+        """
+        steps = self.run_stream(task)
+        done = object()
+
+        while True:
+            chunk = await asyncio.to_thread(next, steps, done)
+            if chunk is done:
+                break
+            yield chunk
+
+    def run_stream(self, task: str) -> Generator[str, None, SubagentResult]:
+        """Execute a task, yielding each ReAct step's output as it is produced.
+
+        Unlike ``run``, output can be shown before the whole run finishes.
+        Counters are updated the same way; if the task fails, the error
+        message is yielded last in place of a final answer.
+
+        Args:
+            task: Task description for the subagent
+
+        Yields:
+            Output of each ReAct iteration; the last one is the final answer
+
+        Returns:
+            SubagentResult with execution details (the generator's return value)
+        """
+        result = yield from self._execute(task)
+        if not result.success:
+            yield result.result
+        return result
+
+    def _iter_react_loop(self, task: str) -> Generator[str, None, Optional[str]]:
+        """Run the ReAct loop one iteration at a time.
 
         Args:
             task: Task to execute
 
+        Yields:
+            Output of each iteration
+
         Returns:
-            Final result
+            Final answer, or None if max iterations were reached
         """
         iteration = 0
         final_answer = None
@@ -146,11 +237,10 @@ class Subagent:
         while iteration < self.max_iterations and final_answer is None:
             iteration += 1
 
-            # Check if context needs compaction
-            messages = self.context_manager.get_messages()
-            if self.token_tracker.is_near_limit(messages, threshold=0.7):
+            # Check if context needs compaction (estimated from characters
+            # unless close to the threshold)
+            if self.context_manager.needs_compaction(threshold=0.7):
                 tokens_saved = self.context_manager.compact(self.token_tracker)
-                messages = self.context_manager.get_messages()
 
             # Get LLM response (this is simplified - in real implementation,
             # you would use LangChain's agent executor or LangGraph)
@@ -166,7 +256,7 @@ class Subagent:
             response_text = f"Iteration {iteration}: Processing task '{task}'"
 
             # Track tokens (placeholder - would come from actual LLM response)
-            prompt_tokens = self.token_tracker.count_messages_tokens(messages)
+            prompt_tokens = self.context_manager.current_tokens()
             completion_tokens = self.token_tracker.count_tokens(response_text)
             self.token_tracker.record_usage(
                 prompt_tokens,
@@ -175,12 +265,14 @@ class Subagent:
             )
 
             # Add response to context
-            self.context_manager.add_message(MessageRole.ASSISTANT, response_text)
+            self.context_manager.add_message(ROLE_ASSISTANT, response_text)
 
             # For this placeholder, we'll complete after first iteration
             final_answer = response_text
 
-        return final_answer or "Max iterations reached without final answer"
+            yield response_text
+
+        return final_answer
 
     def _generate_summary(self) -> str:
         """Generate a summary of the subagent's execution for the parent agent.
@@ -188,24 +280,30 @@ class Subagent:
         Returns:
             Summary string
         """
-        messages = self.context_manager.get_messages()
+        message_count = len(self.context_manager)
         token_usage = self.token_tracker.get_total_usage()
 
-        # Extract key information
-        user_messages = [m for m in messages if m["role"] == MessageRole.USER.value]
-        assistant_messages = [m for m in messages if m["role"] == MessageRole.ASSISTANT.value]
+        # Find the last user and assistant messages in one pass, without
+        # copying the context
+        last_user = last_assistant = None
+        for m in self.context_manager.view_messages():
+            role = m["role"]
+            if role == ROLE_USER:
+                last_user = m
+            elif role == ROLE_ASSISTANT:
+                last_assistant = m
 
         summary_parts = [
             f"Subagent: {self.name}",
-            f"Task: {user_messages[-1]['content'] if user_messages else 'N/A'}",
-            f"Messages exchanged: {len(messages)}",
+            f"Task: {last_user['content'] if last_user else 'N/A'}",
+            f"Messages exchanged: {message_count}",
             f"Tokens used: {token_usage['total_tokens']}",
             f"Context compactions: {self.context_manager.compaction_count}",
         ]
 
         # Add last assistant response
-        if assistant_messages:
-            last_response = assistant_messages[-1]["content"]
+        if last_assistant:
+            last_response = last_assistant["content"]
             if len(last_response) > 200:
                 last_response = last_response[:200] + "..."
             summary_parts.append(f"Last response: {last_response}")
@@ -249,11 +347,12 @@ class Subagent:
         self.execution_count = 0
         self.total_tokens_used = 0
 
-    def export_state(self, filepath: str):
+    def export_state(self, filepath: str, pretty: bool = True):
         """Export subagent state to a file.
 
         Args:
             filepath: Path to save state
+            pretty: Indent the JSON output (default: True)
         """
         state = {
             "name": self.name,
@@ -266,5 +365,4 @@ class Subagent:
             "context_state": self.context_manager.get_state()
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(state, f, indent=2)
+        write_json(state, filepath, pretty=pretty)
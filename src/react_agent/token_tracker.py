@@ -1,11 +1,120 @@
 """Token usage tracking for the ReactAgent."""
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+import os
 import tiktoken
 
 
+@lru_cache(maxsize=None)
+def _encoding_for(model_name: str) -> tiktoken.Encoding:
+    """Get the tokenizer for a model, loading it once per process.
+
+    Args:
+        model_name: Name of the model
+
+    Returns:
+        tiktoken encoding
+    """
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        # Default to cl100k_base encoding if model not found
+        return tiktoken.get_encoding("cl100k_base")
+
+
+# Token counts memoized across all trackers, keyed by (encoding name, text).
+# Contexts are re-counted on every turn while only the newest messages
+# change, so most lookups hit the cache instead of re-encoding. A plain dict
+# (evicting oldest first) lets batch counting look up hits and encode only
+# the misses.
+_TOKEN_CACHE_SIZE = 8192
+_token_counts: Dict[Tuple[str, str], int] = {}
+
+# Threads tiktoken may use for a batch encode
+_ENCODE_THREADS = min(8, os.cpu_count() or 1)
+
+
+def _remember_count(key: Tuple[str, str], count: int):
+    """Store a token count, evicting the oldest entry when the cache is full."""
+    if len(_token_counts) >= _TOKEN_CACHE_SIZE:
+        try:
+            del _token_counts[next(iter(_token_counts))]
+        except (KeyError, StopIteration, RuntimeError):
+            pass  # Another thread evicted concurrently
+    _token_counts[key] = count
+
+
+def _token_count(encoding: tiktoken.Encoding, text: str) -> int:
+    """Count tokens in a text, using the shared cache."""
+    key = (encoding.name, text)
+    count = _token_counts.get(key)
+    if count is None:
+        count = len(encoding.encode(text))
+        _remember_count(key, count)
+    return count
+
+
+def _token_counts_batch(encoding: tiktoken.Encoding, texts: List[str]) -> List[int]:
+    """Count tokens in several texts, encoding all cache misses in one call."""
+    name = encoding.name
+    counts: Dict[str, int] = {}
+    pending = []
+    for text in set(texts):
+        count = _token_counts.get((name, text))
+        if count is None:
+            pending.append(text)
+        else:
+            counts[text] = count
+
+    if pending:
+        encoded = encoding.encode_batch(pending, num_threads=_ENCODE_THREADS)
+        for text, tokens in zip(pending, encoded):
+            counts[text] = len(tokens)
+            _remember_count((name, text), len(tokens))
+
+    return [counts[text] for text in texts]
+
+
+# Rough characters per token for English text and code, used for cheap
+# estimates before counting tokens exactly
+CHARS_PER_TOKEN = 3.5
+
+# Estimates under this fraction of a limit are taken as clearly under it:
+# ASCII text would have to average under 1.4 characters per token (dense
+# hex strings come to about 1.8) to actually reach the limit. Anything
+# closer is counted exactly.
+_CLEARLY_UNDER = 0.4
+
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    """Estimate a message's tokens from the length of its fields, without encoding them.
+
+    Counts the same fields as ``TokenTracker.count_message_tokens``. ASCII
+    is charged CHARS_PER_TOKEN characters per token; every extra UTF-8 byte
+    of other characters is charged a whole token, since CJK and other
+    scripts often take a token or more per character.
+
+    Args:
+        message: Message dictionary with 'role' and 'content'
+
+    Returns:
+        Estimated number of tokens
+    """
+    chars = 0
+    extra_bytes = 0
+    for key, value in message.items():
+        if key[:1] != "_":
+            text = value if type(value) is str else str(value)
+            chars += len(text)
+            if not text.isascii():
+                extra_bytes += len(text.encode("utf-8", errors="replace")) - len(text)
+    return 4 + int(chars / CHARS_PER_TOKEN) + extra_bytes
+
+
 @dataclass
 class TokenUsage:
     """Represents token usage for a single interaction."""
@@ -31,12 +140,12 @@ class TokenTracker:
         self.max_tokens = max_tokens
         self.usage_history: List[TokenUsage] = []
 
-        # Initialize tokenizer
-        try:
-            self.encoding = tiktoken.encoding_for_model(model_name)
-        except KeyError:
-            # Default to cl100k_base encoding if model not found
-            self.encoding = tiktoken.get_encoding("cl100k_base")
+        # Running totals over usage_history
+        self._total_prompt = 0
+        self._total_completion = 0
+
+        # Initialize tokenizer (shared by all trackers for the same model)
+        self.encoding = _encoding_for(model_name)
 
     def count_tokens(self, text: str) -> int:
         """Count tokens in a text string.
@@ -47,26 +156,78 @@ class TokenTracker:
         Returns:
             Number of tokens
         """
-        return len(self.encoding.encode(text))
+        return _token_count(self.encoding, text)
+
+    def count_message_tokens(self, message: Dict[str, Any]) -> int:
+        """Count tokens in a single message, including formatting overhead.
+
+        Keys starting with an underscore are private bookkeeping and are
+        not sent to the model, so they are not counted.
+
+        Args:
+            message: Message dictionary with 'role' and 'content'
+
+        Returns:
+            Number of tokens
+        """
+        # Every message follows <|start|>{role/name}\n{content}<|end|>\n
+        num_tokens = 4  # Message formatting tokens
+        for key, value in message.items():
+            if not key.startswith("_"):
+                num_tokens += self.count_tokens(str(value))
+        return num_tokens
 
-    def count_messages_tokens(self, messages: List[Dict[str, str]]) -> int:
+    def count_message_tokens_batch(self, messages: List[Dict[str, Any]]) -> List[int]:
+        """Count tokens for several messages with a single tokenizer call.
+
+        Same counts as ``count_message_tokens``, but every message field not
+        already in the token count cache is encoded in one multi-threaded
+        ``encode_batch`` call instead of one call per field.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+
+        Returns:
+            Number of tokens for each message
+        """
+        texts = []
+        field_counts = []
+        for message in messages:
+            values = [str(value) for key, value in message.items() if not key.startswith("_")]
+            texts.extend(values)
+            field_counts.append(len(values))
+
+        lengths = iter(_token_counts_batch(self.encoding, texts))
+        return [4 + sum(islice(lengths, n)) for n in field_counts]
+
+    def count_messages_tokens(self, messages: List[Dict[str, Any]]) -> int:
         """Count tokens in a list of messages.
 
+        Uncached message fields are encoded together in one batch call.
+
         Args:
             messages: List of message dictionaries with 'role' and 'content'
 
         Returns:
             Total number of tokens
         """
-        num_tokens = 0
-        for message in messages:
-            # Every message follows <|start|>{role/name}\n{content}<|end|>\n
-            num_tokens += 4  # Message formatting tokens
-            for key, value in message.items():
-                num_tokens += self.count_tokens(str(value))
+        num_tokens = sum(self.count_message_tokens_batch(messages))
         num_tokens += 2  # Every reply is primed with <|start|>assistant
         return num_tokens
 
+    def estimate_messages_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        """Estimate tokens in a list of messages without encoding them.
+
+        Uses the same estimate as ContextManager (see ``estimate_message_tokens``).
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+
+        Returns:
+            Estimated number of tokens
+        """
+        return sum(map(estimate_message_tokens, messages)) + 2
+
     def record_usage(
         self,
         prompt_tokens: int,
@@ -89,6 +250,8 @@ class TokenTracker:
             total_tokens=prompt_tokens + completion_tokens,
             context=context
         )
+        self._total_prompt += prompt_tokens
+        self._total_completion += completion_tokens
         self.usage_history.append(usage)
         return usage
 
@@ -98,8 +261,8 @@ class TokenTracker:
         Returns:
             Dictionary with total usage statistics
         """
-        total_prompt = sum(u.prompt_tokens for u in self.usage_history)
-        total_completion = sum(u.completion_tokens for u in self.usage_history)
+        total_prompt = self._total_prompt
+        total_completion = self._total_completion
 
         return {
             "total_prompt_tokens": total_prompt,
@@ -131,8 +294,11 @@ class TokenTracker:
         Returns:
             True if near limit, False otherwise
         """
-        current_tokens = self.get_current_context_tokens(messages)
-        return current_tokens >= (self.max_tokens * threshold)
+        limit = self.max_tokens * threshold
+        # Only encode when the cheap estimate says the limit may be close
+        if self.estimate_messages_tokens(messages) < limit * _CLEARLY_UNDER:
+            return False
+        return self.get_current_context_tokens(messages) >= limit
 
     def get_usage_summary(self) -> str:
         """Get a formatted summary of token usage.
@@ -160,3 +326,5 @@ Usage Percentage:        {(stats['total_tokens'] / stats['max_tokens'] * 100):.2
     def reset(self):
         """Reset token usage history."""
         self.usage_history.clear()
+        self._total_prompt = 0
+        self._total_completion = 0
@@ -2,14 +2,28 @@
 
 from .filesystem import read_file, write_file, list_directory
 from .glob_tool import glob_search
-from .grep_tool import grep_search
+from .grep_tool import grep_search, grep_search_multi
 from .bash_tool import run_bash_command
 
+# Built once at import and shared by every agent; the tools' argument
+# schemas are generated when the decorators run, not per agent.
+BUILTIN_TOOLS = (
+    read_file,
+    write_file,
+    list_directory,
+    glob_search,
+    grep_search,
+    grep_search_multi,
+    run_bash_command,
+)
+
 __all__ = [
+    "BUILTIN_TOOLS",
     "read_file",
     "write_file",
     "list_directory",
     "glob_search",
     "grep_search",
+    "grep_search_multi",
     "run_bash_command",
 ]
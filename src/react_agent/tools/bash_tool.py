@@ -1,17 +1,176 @@
 """Bash command execution tool."""
 
+import os
+import codecs
+import locale
 import subprocess
-import shlex
-from typing import Optional
+import threading
+from collections import deque
+from typing import IO, Optional, Tuple
 from langchain.tools import tool
 
 
+# Most bytes taken from a pipe per read
+_READ_CHUNK = 8192
+
+# Encoding a text-mode pipe would decode output with
+_ENCODING = locale.getpreferredencoding(False)
+
+
+def _normalize_newlines(text: str) -> str:
+    """Translate newlines the way a text-mode pipe would."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _decode_output(data: bytes) -> str:
+    """Decode command output the way a text-mode pipe would, replacing invalid bytes."""
+    return _normalize_newlines(data.decode(_ENCODING, errors="replace"))
+
+
+def _decode_cut(head: bytes, tail: bytes) -> Tuple[str, str, int]:
+    """Decode the two sides of a cut, leaving out the halves of a character split at either edge.
+
+    Returns:
+        (head text, tail text, number of bytes left out)
+    """
+    # The incremental decoder holds back a character cut off at the end
+    decoder = codecs.getincrementaldecoder(_ENCODING)(errors="replace")
+    head_text = decoder.decode(head)
+    skipped = len(decoder.getstate()[0])
+
+    # In UTF-8 a cut character's remaining bytes are continuation bytes
+    if codecs.lookup(_ENCODING).name == "utf-8":
+        start = 0
+        while start < min(3, len(tail)) and 0x80 <= tail[start] < 0xC0:
+            start += 1
+        tail = tail[start:]
+        skipped += start
+
+    return _normalize_newlines(head_text), _decode_output(tail), skipped
+
+
+class _CappedOutput:
+    """Keeps the head and tail of a byte stream, dropping the middle past a size cap.
+
+    A reader thread writes while the caller may already be collecting the
+    value (a background child can hold the pipe open after the command
+    exits), so writes and reads of the buffers go through a lock.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.head_cap = max_bytes // 2
+        self.tail_cap = max_bytes - self.head_cap
+        self.head = []
+        self.head_size = 0
+        self.tail = deque()
+        self.tail_size = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def write(self, chunk: bytes):
+        with self._lock:
+            self._write(chunk)
+
+    def _write(self, chunk: bytes):
+        if self.head_size < self.head_cap:
+            room = self.head_cap - self.head_size
+            self.head.append(chunk[:room])
+            self.head_size += min(room, len(chunk))
+            chunk = chunk[room:]
+            if not chunk:
+                return
+
+        self.tail.append(chunk)
+        self.tail_size += len(chunk)
+        while self.tail_size > self.tail_cap:
+            excess = self.tail_size - self.tail_cap
+            oldest = self.tail[0]
+            if len(oldest) <= excess:
+                self.tail.popleft()
+                self.tail_size -= len(oldest)
+                self.dropped += len(oldest)
+            else:
+                self.tail[0] = oldest[excess:]
+                self.tail_size -= excess
+                self.dropped += excess
+
+    def drain(self, stream: IO[bytes]):
+        """Read a stream to EOF into the buffer."""
+        for chunk in iter(lambda: stream.read1(_READ_CHUNK), b""):
+            self.write(chunk)
+        stream.close()
+
+    def getvalue(self) -> str:
+        with self._lock:
+            head = b"".join(self.head)
+            tail = b"".join(self.tail)
+            dropped = self.dropped
+        if dropped:
+            head_text, tail_text, skipped = _decode_cut(head, tail)
+            return f"{head_text}\n... [truncated {dropped + skipped} bytes] ...\n{tail_text}"
+        return _decode_output(head + tail)
+
+
+# Commands answered in-process: name -> fn(cwd) returning (exit code, stdout)
+_FAST_COMMANDS = {
+    "pwd": lambda cwd: (0, cwd + "\n"),
+    "true": lambda cwd: (0, ""),
+    "false": lambda cwd: (1, ""),
+}
+
+
+def _run_capped(
+    command: str,
+    timeout: int,
+    working_dir: Optional[str],
+    capture_output: bool,
+    max_output_bytes: int
+) -> subprocess.CompletedProcess:
+    """Run a shell command, keeping at most max_output_bytes of each output stream."""
+    # Stream output into bounded buffers so a noisy command can't grow the
+    # agent's memory or context without limit
+    pipe = subprocess.PIPE if capture_output else None
+    proc = subprocess.Popen(
+        command,
+        shell=True,
+        stdout=pipe,
+        stderr=pipe,
+        cwd=working_dir
+    )
+
+    stdout = _CappedOutput(max_output_bytes)
+    stderr = _CappedOutput(max_output_bytes)
+    readers = []
+    if capture_output:
+        readers = [
+            threading.Thread(target=stdout.drain, args=(proc.stdout,), daemon=True),
+            threading.Thread(target=stderr.drain, args=(proc.stderr,), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join(timeout=1)
+
+    return subprocess.CompletedProcess(command, returncode, stdout.getvalue(), stderr.getvalue())
+
+
 @tool
 def run_bash_command(
     command: str,
     timeout: int = 30,
     working_dir: Optional[str] = None,
-    capture_output: bool = True
+    capture_output: bool = True,
+    max_output_bytes: int = 131072
 ) -> str:
     """Execute a bash command and return the output.
 
@@ -20,6 +179,8 @@ def run_bash_command(
         timeout: Maximum execution time in seconds (default: 30)
         working_dir: Working directory for command execution (default: current)
         capture_output: Whether to capture and return output (default: True)
+        max_output_bytes: Maximum bytes kept per stream; beyond this only
+            the beginning and end are returned (default: 131072)
 
     Returns:
         Command output or error message
@@ -39,36 +200,34 @@ def run_bash_command(
         if not command.strip():
             return "Error: Empty command"
 
-        # Execute command
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=capture_output,
-            text=True,
-            timeout=timeout,
-            cwd=working_dir
-        )
+        # Answer trivial commands in-process instead of spawning a shell
+        fast = _FAST_COMMANDS.get(command.strip())
+        if fast is not None and capture_output and (working_dir is None or os.path.isdir(working_dir)):
+            returncode, stdout = fast(os.path.realpath(working_dir) if working_dir else os.getcwd())
+            result = subprocess.CompletedProcess(command, returncode, stdout, "")
+        else:
+            result = _run_capped(command, timeout, working_dir, capture_output, max_output_bytes)
 
         # Format output
-        output = f"Command: {command}\n"
+        parts = [f"Command: {command}\n"]
 
         if working_dir:
-            output += f"Working Directory: {working_dir}\n"
+            parts.append(f"Working Directory: {working_dir}\n")
 
-        output += f"Exit Code: {result.returncode}\n\n"
+        parts.append(f"Exit Code: {result.returncode}\n\n")
 
         if result.stdout:
-            output += "STDOUT:\n"
-            output += result.stdout
+            parts.append("STDOUT:\n")
+            parts.append(result.stdout)
 
         if result.stderr:
-            output += "\nSTDERR:\n"
-            output += result.stderr
+            parts.append("\nSTDERR:\n")
+            parts.append(result.stderr)
 
         if result.returncode != 0:
-            output += f"\n\nWarning: Command exited with non-zero status: {result.returncode}"
+            parts.append(f"\n\nWarning: Command exited with non-zero status: {result.returncode}")
 
-        return output
+        return "".join(parts)
 
     except subprocess.TimeoutExpired:
         return f"Error: Command timed out after {timeout} seconds"
@@ -1,11 +1,126 @@
 """Filesystem tools for reading and writing files."""
 
+import io
 import os
+import stat
+import codecs
 from pathlib import Path
-from typing import Optional
+from operator import attrgetter
+from typing import Iterator, Optional, Tuple
 from langchain.tools import tool
 
 
+# Bytes requested per read() call
+_READ_CHUNK = 1 << 20
+
+# Files larger than this are not read into memory
+MAX_FILE_BYTES = 64 << 20
+
+# Bytes sniffed from the start of a file to detect binary content
+_SNIFF_BYTES = 4096
+
+def _looks_binary(head: bytes) -> bool:
+    """Guess whether a file is binary from its first bytes.
+
+    Text with control bytes (ANSI colour codes, form feeds) still counts as
+    text; only a NUL or bytes that aren't UTF-8 mark a file as binary. A
+    few stray invalid bytes (Latin-1 accents in mostly ASCII text) are
+    tolerated.
+
+    Args:
+        head: The first bytes of the file
+
+    Returns:
+        True if the bytes contain a NUL or more than 10% are not valid UTF-8
+    """
+    if b"\x00" in head:
+        return True
+    if head.isascii():
+        return False
+
+    # The window may end inside a character, which the decoder holds back
+    # instead of counting it as invalid
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    valid_bytes = len(decoder.decode(head).encode("utf-8")) + len(decoder.getstate()[0])
+    return len(head) - valid_bytes > len(head) // 10
+
+
+def _read_bytes(path: Path, check_binary: bool = False) -> Optional[bytes]:
+    """Read a whole file with unbuffered os.read calls.
+
+    The first read asks for the fstat size plus one byte, so an ordinary
+    file arrives in one read, followed by the empty read that marks the
+    end of the file. Reads may return less than requested (network and
+    FUSE filesystems, signals), so reading always continues until that
+    empty read. Larger files also hint sequential access to the kernel
+    where supported so read-ahead stays ahead of the remaining reads.
+
+    Args:
+        path: File to read
+        check_binary: Sniff the first bytes and stop if they look binary
+
+    Returns:
+        The file's bytes, or None if check_binary found binary content
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size > _READ_CHUNK and hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        data = os.read(fd, size + 1)
+        if check_binary and _looks_binary(data[:_SNIFF_BYTES]):
+            return None
+
+        chunks = []
+        while data:
+            chunks.append(data)
+            data = os.read(fd, _READ_CHUNK)
+    finally:
+        os.close(fd)
+
+    # The common single-read case needs no join (and no copy)
+    return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+def _sorted_entries(directory: str) -> Iterator[os.DirEntry]:
+    """Iterate a directory's entries sorted by name; unreadable directories are empty."""
+    try:
+        with os.scandir(directory) as it:
+            return iter(sorted(it, key=attrgetter("name")))
+    except OSError:
+        return iter(())
+
+
+def _walk_tree(root: str) -> Iterator[Tuple[os.DirEntry, str]]:
+    """Recursively yield (entry, relative path) for everything under root.
+
+    Walks with os.scandir and an explicit stack, so entry types come from
+    the directory listing instead of separate stat calls, and entries are
+    produced lazily in sorted path order. Like Path.rglob, symlinked
+    directories are reported but not descended into, and unreadable
+    directories are skipped.
+
+    Args:
+        root: Directory to walk
+
+    Yields:
+        Each entry and its path relative to root
+    """
+    stack = [(_sorted_entries(root), "")]
+    while stack:
+        entries, prefix = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        rel_path = prefix + entry.name
+        yield entry, rel_path
+        if entry.is_dir() and not entry.is_symlink():
+            stack.append((_sorted_entries(entry.path), rel_path + os.sep))
+
+
 @tool
 def read_file(file_path: str, encoding: str = "utf-8") -> str:
     """Read the contents of a file.
@@ -30,8 +145,20 @@ def read_file(file_path: str, encoding: str = "utf-8") -> str:
         if not path.is_file():
             return f"Error: Path is not a file: {file_path}"
 
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
+        size = path.stat().st_size
+        if size > MAX_FILE_BYTES:
+            return f"Error: File is too large to read ({size} bytes, limit {MAX_FILE_BYTES}): {file_path}"
+
+        # Only sniff for binary content when reading as UTF-8, since other
+        # encodings (e.g. UTF-16) legitimately contain NUL bytes
+        data = _read_bytes(path, check_binary=codecs.lookup(encoding).name in ("utf-8", "utf-8-sig"))
+        if data is None:
+            return f"Error: File appears to be binary: {file_path}"
+
+        # Decode in one pass, translating newlines like a text-mode read
+        content = data.decode(encoding)
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
 
         return f"File: {file_path}\n" \
                f"Size: {len(content)} characters\n" \
@@ -87,7 +214,8 @@ def write_file(file_path: str, content: str, encoding: str = "utf-8", mode: str
 def list_directory(
     directory_path: str = ".",
     show_hidden: bool = False,
-    recursive: bool = False
+    recursive: bool = False,
+    max_entries: int = 10000
 ) -> str:
     """List contents of a directory.
 
@@ -95,6 +223,7 @@ def list_directory(
         directory_path: Path to the directory (default: current directory)
         show_hidden: Whether to show hidden files (default: False)
         recursive: Whether to list recursively (default: False)
+        max_entries: Maximum number of entries to list (default: 10000)
 
     Returns:
         Formatted list of directory contents
@@ -105,46 +234,50 @@ def list_directory(
         list_directory("src", recursive=True)
     """
     try:
-        path = Path(directory_path).expanduser().resolve()
+        path = os.path.realpath(os.path.expanduser(directory_path))
 
-        if not path.exists():
+        # One stat answers both the existence and the directory checks
+        try:
+            mode = os.stat(path).st_mode
+        except (FileNotFoundError, NotADirectoryError):
             return f"Error: Directory not found: {directory_path}"
 
-        if not path.is_dir():
+        if not stat.S_ISDIR(mode):
             return f"Error: Path is not a directory: {directory_path}"
 
-        entries = []
-
         if recursive:
             # Recursive listing
-            for item in path.rglob("*"):
-                if not show_hidden and item.name.startswith("."):
-                    continue
-
-                rel_path = item.relative_to(path)
-                item_type = "DIR" if item.is_dir() else "FILE"
-                size = item.stat().st_size if item.is_file() else "-"
-
-                entries.append(f"{item_type:5} {size:>10} {rel_path}")
+            items = _walk_tree(path)
         else:
             # Single level listing
-            for item in sorted(path.iterdir()):
-                if not show_hidden and item.name.startswith("."):
-                    continue
+            with os.scandir(path) as it:
+                items = [(entry, entry.name) for entry in sorted(it, key=attrgetter("name"))]
+
+        # Lines are written as entries are found instead of collected and joined
+        out = io.StringIO()
+        count = 0
+        for entry, name in items:
+            if not show_hidden and entry.name.startswith("."):
+                continue
+
+            if count >= max_entries:
+                out.write(f"\n... truncated after {max_entries} entries")
+                break
+            count += 1
 
-                item_type = "DIR" if item.is_dir() else "FILE"
-                size = item.stat().st_size if item.is_file() else "-"
+            item_type = "DIR" if entry.is_dir() else "FILE"
+            size = entry.stat().st_size if entry.is_file() else "-"
 
-                entries.append(f"{item_type:5} {size:>10} {item.name}")
+            out.write(f"\n{item_type:5} {size:>10} {name}")
 
-        if not entries:
+        if not count:
             return f"Directory is empty: {directory_path}"
 
         header = f"Directory: {directory_path}\n" \
                 f"{'Type':<5} {'Size':>10} Name\n" \
                 f"{'-' * 50}"
 
-        return header + "\n" + "\n".join(entries)
+        return header + out.getvalue()
 
     except PermissionError:
         return f"Error: Permission denied accessing directory: {directory_path}"
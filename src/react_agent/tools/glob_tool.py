@@ -1,9 +1,21 @@
 """Glob pattern matching tool."""
 
+import io
+import os
+import re
+import fnmatch
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
 from langchain.tools import tool
 
+from .filesystem import _walk_tree
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a name-only glob pattern to a regex, once per distinct pattern."""
+    return re.compile(fnmatch.translate(pattern))
+
 
 @tool
 def glob_search(pattern: str, root_path: str = ".", recursive: bool = True) -> str:
@@ -31,42 +43,64 @@ def glob_search(pattern: str, root_path: str = ".", recursive: bool = True) -> s
         if not root.is_dir():
             return f"Error: Root path is not a directory: {root_path}"
 
-        # Use rglob for recursive patterns or glob for non-recursive
-        if recursive and "**" in pattern:
-            matches = list(root.glob(pattern))
-        elif recursive:
-            matches = list(root.rglob(pattern))
+        # Name-only patterns are matched against entry names from os.scandir
+        # (a single directory, or a walk of the tree); patterns with path
+        # components still go through Path.glob
+        dirs = []
+        files = []
+        match_count = 0
+        if "**" not in pattern and "/" not in pattern:
+            name_regex = _compile_pattern(pattern)
+            if recursive:
+                entries = _walk_tree(str(root))
+            else:
+                with os.scandir(root) as it:
+                    entries = [(entry, entry.name) for entry in it]
+
+            for entry, rel in entries:
+                if not name_regex.match(entry.name):
+                    continue
+                match_count += 1
+                if entry.is_dir():
+                    dirs.append(rel)
+                elif entry.is_file():
+                    files.append((rel, entry.stat().st_size))
         else:
-            matches = list(root.glob(pattern))
-
-        if not matches:
+            matches = root.rglob(pattern) if recursive and "**" not in pattern else root.glob(pattern)
+            for m in matches:
+                match_count += 1
+                rel = str(m.relative_to(root))
+                if m.is_dir():
+                    dirs.append(rel)
+                elif m.is_file():
+                    files.append((rel, m.stat().st_size))
+
+        if not match_count:
             return f"No files found matching pattern: {pattern}"
 
-        # Sort matches and convert to relative paths
-        matches.sort()
-        relative_matches = [str(m.relative_to(root)) for m in matches]
-
-        # Separate files and directories
-        files = [m for m in matches if m.is_file()]
-        dirs = [m for m in matches if m.is_dir()]
+        # Sort by path components, matching the order of sorted Path objects
+        dirs.sort(key=lambda rel: rel.split(os.sep))
+        files.sort(key=lambda item: item[0].split(os.sep))
 
-        result = f"Glob search: {pattern}\n" \
-                f"Root: {root}\n" \
-                f"Found {len(matches)} matches ({len(files)} files, {len(dirs)} directories)\n\n"
+        out = io.StringIO()
+        out.write(
+            f"Glob search: {pattern}\n"
+            f"Root: {root}\n"
+            f"Found {match_count} matches ({len(files)} files, {len(dirs)} directories)\n\n"
+        )
 
         if dirs:
-            result += "Directories:\n"
+            out.write("Directories:\n")
             for d in dirs:
-                result += f"  DIR  {d.relative_to(root)}/\n"
-            result += "\n"
+                out.write(f"  DIR  {d}/\n")
+            out.write("\n")
 
         if files:
-            result += "Files:\n"
-            for f in files:
-                size = f.stat().st_size
-                result += f"  FILE {size:>10} {f.relative_to(root)}\n"
+            out.write("Files:\n")
+            for f, size in files:
+                out.write(f"  FILE {size:>10} {f}\n")
 
-        return result
+        return out.getvalue()
 
     except Exception as e:
         return f"Error performing glob search: {str(e)}"
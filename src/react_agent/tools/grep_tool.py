@@ -1,10 +1,564 @@
 """Grep text search tool."""
 
+import io
+import os
 import re
+import json
+import mmap
+import base64
+import shutil
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from langchain.tools import tool
 
+from .filesystem import MAX_FILE_BYTES, _SNIFF_BYTES, _looks_binary, _walk_tree
+from .glob_tool import _compile_pattern
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+# Patterns containing these can match a line on its own but not in the middle
+# of a whole file (end/start anchors, negative lookarounds, \B at a line end),
+# so they are always searched line by line
+_LINE_ONLY_SYNTAX = re.compile(r"\$|\\[AZB]|\(\?<?!")
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str, flags: int) -> re.Pattern:
+    """Compile a search pattern, once per distinct (pattern, flags)."""
+    return re.compile(pattern, flags)
+
+
+# RE2's shorthand classes and word boundaries are ASCII-only, and RE2 and
+# ripgrep's Rust regex read [:alpha:] as a POSIX class, unlike re on str; Rust
+# regex's shorthand classes also differ from re's in which Unicode characters
+# they cover, and it reads &&, -- and ~~ in a class as set operations and a
+# [ in a class as a nested class, where re reads them literally. re reads
+# {,n} as {0,n}; RE2 reads it as literal text and Rust regex rejects it.
+# Patterns with these are only searched with re.
+_ENGINE_MISMATCH = re.compile(r"\\[wWdDsSbB]|\[:|&&|--|~~|\[[^\]]*\[|\{,")
+
+
+@lru_cache(maxsize=256)
+def _compile_re2(pattern: str, flags: int):
+    """Compile a search pattern with RE2, which matches in linear time.
+
+    Args:
+        pattern: Regular expression pattern
+        flags: re.IGNORECASE and/or re.MULTILINE
+
+    Returns:
+        The compiled RE2 pattern, or None if google-re2 isn't installed,
+        doesn't support the pattern (e.g. backreferences, lookarounds) or
+        would match it differently than re
+    """
+    if re2 is None or _ENGINE_MISMATCH.search(pattern):
+        return None
+
+    options = re2.Options()
+    options.log_errors = False
+    options.case_sensitive = not flags & re.IGNORECASE
+    try:
+        return re2.compile("(?m)" + pattern if flags & re.MULTILINE else pattern, options)
+    except re2.error:
+        return None
+
+
+@lru_cache(maxsize=256)
+def _required_literal(pattern: str, flags: int) -> Optional[str]:
+    """Get the longest literal string every match of a pattern must contain.
+
+    Only literals at the top level of the pattern are considered, since
+    those are required by every match; alternations, groups and repeats
+    end a run.
+
+    Args:
+        pattern: Regular expression pattern
+        flags: Flags the pattern is compiled with
+
+    Returns:
+        The literal, or None if the pattern has no usable literal
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+
+    best = ""
+    run = []
+    for op, value in list(parsed) + [(None, None)]:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(value))
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+
+    if not best or "\n" in best or "\r" in best:
+        return None
+    return best
+
+
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+@lru_cache(maxsize=256)
+def _literal_prefilter(literal: str, ignore_case: bool) -> re.Pattern:
+    """Compile a bytes pattern that finds a required literal in raw file bytes."""
+    return re.compile(re.escape(literal.encode('utf-8')), re.IGNORECASE if ignore_case else 0)
+
+
+def _bytes_may_match(data, prefilter: re.Pattern) -> bool:
+    """Check raw file bytes for a required literal before decoding them.
+
+    A miss only rules the file out when it is pure ASCII: otherwise the
+    literal could differ in case beyond ASCII or be split by invalid UTF-8
+    that decoding drops, so the decoded text still has to be checked.
+    """
+    return prefilter.search(data) is not None or _NON_ASCII.search(data) is not None
+
+
+class _SkippedFile(Exception):
+    """Raised for files grep doesn't search (too large or binary)."""
+
+
+def _read_text(file_path: str, prefilter: Optional[re.Pattern] = None) -> Optional[str]:
+    """Read a file as UTF-8 text the way a text-mode read would.
+
+    The file is memory-mapped and decoded straight from the mapping, so its
+    bytes are not first copied into a bytes object. Invalid UTF-8 is
+    dropped and newlines are normalized to "\\n".
+
+    Args:
+        file_path: File to read
+        prefilter: Bytes pattern for a literal every match needs; files
+            that certainly lack it are not decoded
+
+    Returns:
+        The text, or None if the prefilter ruled the file out
+
+    Raises:
+        _SkippedFile: If the file is over MAX_FILE_BYTES or looks binary
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > MAX_FILE_BYTES:
+            raise _SkippedFile(file_path)
+
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Queue read-ahead for the whole file in one call before the
+                # first page fault, so the disk sees the file's reads at once
+                if size > _SNIFF_BYTES and hasattr(mmap, "MADV_WILLNEED"):
+                    mm.madvise(mmap.MADV_WILLNEED)
+                if _looks_binary(mm[:_SNIFF_BYTES]):
+                    raise _SkippedFile(file_path)
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                if prefilter is not None and not _bytes_may_match(mm, prefilter):
+                    return None
+                text = str(mm, 'utf-8', errors='ignore')
+        except (ValueError, OSError):
+            # Empty files and special files can't be mapped
+            data = f.read()
+            if _looks_binary(data[:_SNIFF_BYTES]):
+                raise _SkippedFile(file_path)
+            if prefilter is not None and not _bytes_may_match(data, prefilter):
+                return None
+            text = data.decode('utf-8', errors='ignore')
+
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _file_may_match(text: str, literal: Optional[str], ignore_case: bool) -> bool:
+    """Cheaply rule out files that can't contain a match."""
+    if literal is None:
+        return True
+    if not ignore_case:
+        return literal in text
+    # ASCII lowercasing is exact only for ASCII text; Unicode case folding
+    # (e.g. the Kelvin sign matching "k") needs the regex itself
+    if literal.isascii() and text.isascii():
+        return literal.lower() in text.lower()
+    return True
+
+
+def _search_text(text: str, regex: re.Pattern, file_regex: Optional[re.Pattern], limit: int) -> List[tuple]:
+    """Find the lines of a text that match a regex.
+
+    Args:
+        text: File contents with newlines normalized to "\\n"
+        regex: Pattern applied to each line (including its newline)
+        file_regex: The same pattern in MULTILINE mode, used to jump between
+            candidate lines in one scan of the whole text (None to check
+            every line); may be an RE2 pattern
+        limit: Maximum number of matching lines to return
+
+    Returns:
+        List of (line number, line) pairs
+    """
+    matches = []
+    if file_regex is None:
+        for line_num, line in enumerate(io.StringIO(text), 1):
+            if regex.search(line):
+                matches.append((line_num, line))
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    # RE2 re-encodes str input on every search call, so it scans the UTF-8
+    # bytes of the text instead, encoded once
+    haystack = text
+    newline = "\n"
+    if not isinstance(file_regex, re.Pattern):
+        haystack = text.encode('utf-8')
+        newline = b"\n"
+
+    # Every line that matches on its own also contains a whole-text match,
+    # so only lines where the whole-text scan finds one need checking
+    pos = 0
+    line_num = 1
+    counted_to = 0
+    while True:
+        match = file_regex.search(haystack, pos)
+        if match is None:
+            break
+
+        start = match.start()
+        line_start = haystack.rfind(newline, 0, start) + 1
+        line_end = haystack.find(newline, start)
+        line = haystack[line_start:] if line_end == -1 else haystack[line_start:line_end + 1]
+        if not line:
+            break  # Empty match past the final newline
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+
+        line_num += haystack.count(newline, counted_to, line_start)
+        counted_to = line_start
+
+        if regex.search(line):
+            matches.append((line_num, line))
+            if len(matches) >= limit:
+                break
+
+        if line_end == -1:
+            break
+        pos = line_end + 1
+
+    return matches
+
+
+def _plan_search(pattern: str, flags: int) -> tuple:
+    """Prepare what scanning files for one pattern needs.
+
+    Args:
+        pattern: Regular expression pattern (already validated with re)
+        flags: re flags for the search
+
+    Returns:
+        (regex, file_regex, literal, ignore_case)
+    """
+    regex = _compile(pattern, flags)
+    # A global inline (?i) makes the whole pattern case-insensitive even for
+    # a case-sensitive search, so the literal prefilters must ignore case too
+    ignore_case = bool(regex.flags & re.IGNORECASE)
+
+    # Scan whole files when per-line semantics allow it, and skip files
+    # that lack a literal every match needs
+    file_regex = None
+    if not _LINE_ONLY_SYNTAX.search(pattern):
+        file_regex = _compile(pattern, flags | re.MULTILINE)
+        # Use RE2 when it is installed and agrees with re on the pattern
+        re2_regex = _compile_re2(pattern, flags)
+        if re2_regex is not None:
+            regex = re2_regex
+            file_regex = _compile_re2(pattern, flags | re.MULTILINE)
+
+    return regex, file_regex, _required_literal(pattern, flags), ignore_case
+
+
+def _scan_lines(file_path: str, searches: tuple, limit: int) -> Optional[tuple]:
+    """Search one file for one or more patterns, reading it once.
+
+    Args:
+        file_path: File to search
+        searches: A _plan_search tuple for each pattern
+        limit: Maximum number of matching lines per pattern
+
+    Returns:
+        For each pattern, up to limit (line number, stripped line) pairs,
+        or None if the file was skipped
+    """
+    # The bytes prefilter can only rule the whole file out for a single pattern
+    prefilter = None
+    if len(searches) == 1 and searches[0][2] is not None:
+        prefilter = _literal_prefilter(searches[0][2], searches[0][3])
+    try:
+        text = _read_text(file_path, prefilter)
+    except (PermissionError, UnicodeDecodeError, _SkippedFile):
+        # Skip files we can't read, and large or binary files
+        return None
+
+    if text is None:
+        return ((),)
+
+    return tuple(
+        tuple((line_num, line.rstrip()) for line_num, line in _search_text(text, regex, file_regex, limit))
+        if _file_may_match(text, literal, ignore_case) else ()
+        for regex, file_regex, literal, ignore_case in searches
+    )
+
+
+# Files up to this size have their scan results memoized
+_CACHE_MAX_BYTES = 1 << 20
+
+
+@lru_cache(maxsize=4096)
+def _scan_lines_cached(file_path: str, mtime_ns: int, size: int, searches: tuple, limit: int) -> Optional[tuple]:
+    """Memoized _scan_lines; mtime_ns and size in the key invalidate entries when the file changes."""
+    return _scan_lines(file_path, searches, limit)
+
+
+def _scan_file(file_path: str, rel_path: str, searches: tuple, limit: int) -> Optional[List[List[tuple]]]:
+    """Search one file, reusing the results of an identical earlier search of it.
+
+    Returns:
+        For each pattern, up to limit (file, line number, content) results,
+        or None if the file was skipped
+    """
+    st = os.stat(file_path)
+    if st.st_size <= _CACHE_MAX_BYTES:
+        found = _scan_lines_cached(file_path, st.st_mtime_ns, st.st_size, searches, limit)
+    else:
+        found = _scan_lines(file_path, searches, limit)
+
+    if found is None:
+        return None
+    return [[(rel_path, line_num, content) for line_num, content in lines] for lines in found]
+
+
+# File types grep_search never searches
+_SKIP_SUFFIXES = ('.pyc', '.so', '.o', '.a', '.exe', '.dll', '.bin')
+
+# ripgrep, used for searches when it is installed
+_RG = shutil.which("rg")
+
+# Seconds a ripgrep search may run before falling back to the Python scan
+_RG_TIMEOUT = 60
+
+
+def _rg_text(field: Dict[str, Any]) -> str:
+    """Get the text of a ripgrep JSON text/bytes field."""
+    if "text" in field:
+        return field["text"]
+    return base64.b64decode(field["bytes"]).decode('utf-8', errors='ignore')
+
+
+def _sniff_binary(file_path: str) -> bool:
+    """Check whether a file looks binary from its first bytes; unreadable files count as binary."""
+    try:
+        with open(file_path, 'rb') as f:
+            return _looks_binary(f.read(_SNIFF_BYTES))
+    except OSError:
+        return True
+
+
+def _ripgrep_search(
+    pattern: str,
+    search_path: Path,
+    file_pattern: str,
+    case_sensitive: bool,
+    max_results: int
+) -> Optional[tuple]:
+    """Search with ripgrep, configured to search the same files as the Python scan.
+
+    Output is read as it is produced and ripgrep is stopped once
+    max_results matches have arrived, so it doesn't search the rest of
+    the tree.
+
+    Returns:
+        (results, files_searched), or None if ripgrep failed (for example on
+        regex syntax it doesn't support) and the Python scan should be used
+    """
+    limit = max(1, max_results)
+    command = [
+        _RG, "--json", "--no-config", "--no-ignore", "--hidden", "--sort", "path",
+        # $ matches before \r\n too, like the Python scan's normalized newlines
+        "--crlf",
+        "--max-filesize", str(MAX_FILE_BYTES),
+        "--ignore-case" if not case_sensitive else "--case-sensitive",
+        "--max-count", str(limit),
+        "--glob", file_pattern,
+    ]
+    for suffix in _SKIP_SUFFIXES:
+        command += ["--glob", f"!*{suffix}"]
+    command += ["--regexp", pattern, "--", str(search_path)]
+
+    try:
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return None
+
+    # A search that runs too long is killed and left to the Python scan
+    timer = threading.Timer(_RG_TIMEOUT, proc.kill)
+    timer.start()
+
+    results = []
+    files_searched = 0
+    files_with_matches = 0
+    stopped = False
+    search_dir = search_path.is_dir()
+    # Matches arrive grouped by file, so each file's relative path is computed once
+    last_path = rel_path = None
+    skip_file = False
+    try:
+        for line in proc.stdout:
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "begin":
+                # ripgrep only treats files with a NUL as binary; apply the
+                # same sniff as the Python scan to the files that matched
+                skip_file = _sniff_binary(_rg_text(message["data"]["path"]))
+                if not skip_file:
+                    files_with_matches += 1
+            elif kind == "match" and not skip_file:
+                data = message["data"]
+                path_text = _rg_text(data["path"])
+                if path_text != last_path:
+                    last_path = path_text
+                    file_path = Path(path_text)
+                    rel_path = str(file_path.relative_to(search_path)) if search_dir else file_path.name
+                results.append((rel_path, data["line_number"], _rg_text(data["lines"]).rstrip()))
+                if len(results) >= limit:
+                    stopped = True
+                    break
+            elif kind == "summary":
+                files_searched = message["data"]["stats"]["searches"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        returncode = proc.wait()
+
+    if stopped:
+        # ripgrep's stats come at the end; only the files that produced
+        # matches are known to have been searched
+        return results, files_with_matches
+    if returncode not in (0, 1):
+        return None
+    return results, files_searched
+
+
+def _iter_files(search_path: Path, file_pattern: str) -> Iterator[Tuple[str, str]]:
+    """Yield (path, relative path) for the files under search_path matching file_pattern.
+
+    Name-only patterns are matched during a single scandir walk; patterns
+    with path components go through Path.rglob.
+    """
+    if "/" in file_pattern or "**" in file_pattern:
+        for f in search_path.rglob(file_pattern):
+            if f.is_file():
+                yield str(f), str(f.relative_to(search_path))
+        return
+
+    name_regex = _compile_pattern(file_pattern)
+    for entry, rel_path in _walk_tree(str(search_path)):
+        if name_regex.match(entry.name) and entry.is_file():
+            yield entry.path, rel_path
+
+
+# Upper bound on threads used to scan files in parallel
+_MAX_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+# Files submitted to the scan pool ahead of the one being consumed
+_SCAN_WINDOW = 2 * _MAX_SCAN_WORKERS
+
+
+def _python_search(searches: tuple, search_path: Path, file_pattern: str, max_results: int) -> tuple:
+    """Search files with Python's re module (or RE2), for one or more patterns.
+
+    Args:
+        searches: A _plan_search tuple for each pattern
+        search_path: File or directory to search
+        file_pattern: Glob pattern for files to search
+        max_results: Maximum number of results per pattern
+
+    Returns:
+        (results for each pattern, files_searched)
+    """
+    results = [[] for _ in searches]
+    files_searched = 0
+
+    # Determine files to search, with relative paths for cleaner output
+    if search_path.is_file():
+        files_to_search = [(str(search_path), search_path.name)]
+    else:
+        files_to_search = _iter_files(search_path, file_pattern)
+
+    # Skip binary files and common non-text files
+    files_to_search = ((f, rel) for f, rel in files_to_search if os.path.splitext(rel)[1] not in _SKIP_SUFFIXES)
+
+    # Files are read and scanned on a thread pool (file reads and the regex
+    # engine release the GIL) but consumed in order, so results match a
+    # sequential scan. Only a bounded window of files is submitted ahead of
+    # the consumer, so reaching max_results also stops the directory walk.
+    per_file_limit = max(1, max_results)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as executor:
+        def submit(items):
+            for f, rel in items:
+                pending.append(executor.submit(_scan_file, f, rel, searches, per_file_limit))
+
+        try:
+            submit(islice(files_to_search, _SCAN_WINDOW))
+            while pending:
+                file_results = pending.popleft().result()
+                submit(islice(files_to_search, 1))
+                if file_results is None:
+                    continue
+
+                for pattern_results, found in zip(results, file_results):
+                    pattern_results.extend(found[:per_file_limit - len(pattern_results)])
+                files_searched += 1
+
+                if all(len(pattern_results) >= max_results for pattern_results in results):
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+
+    return results, files_searched
+
+
+def _format_results(parts: List[str], results: List[tuple]):
+    """Append (file, line number, content) results to parts, grouped by file."""
+    current_file = None
+    for file, line_num, content in results:
+        if file != current_file:
+            current_file = file
+            parts.append(f"\n{current_file}:\n")
+
+        parts.append(f"  {line_num:4d}: {content}\n")
+
 
 @tool
 def grep_search(
@@ -16,6 +570,9 @@ def grep_search(
 ) -> str:
     """Search for text pattern in files (similar to grep).
 
+    Patterns use Python regex syntax. When google-re2 is installed, patterns
+    it supports are matched in linear time.
+
     Args:
         pattern: Regular expression pattern to search for
         path: Directory or file to search in (default: current directory)
@@ -40,78 +597,109 @@ def grep_search(
         # Compile regex pattern
         flags = 0 if case_sensitive else re.IGNORECASE
         try:
-            regex = re.compile(pattern, flags)
+            _compile(pattern, flags)
         except re.error as e:
             return f"Error: Invalid regex pattern: {str(e)}"
 
-        results = []
-        files_searched = 0
+        # Prefer ripgrep for name-only file patterns and patterns it matches
+        # like re; fall back to the Python scan if it isn't installed or
+        # can't handle the pattern
+        found = None
+        if _RG and "/" not in file_pattern and not _ENGINE_MISMATCH.search(pattern):
+            found = _ripgrep_search(pattern, search_path, file_pattern, case_sensitive, max_results)
+        if found is None:
+            all_results, files_searched = _python_search(
+                (_plan_search(pattern, flags),), search_path, file_pattern, max_results
+            )
+            found = all_results[0], files_searched
+        results, files_searched = found
 
-        # Determine files to search
-        if search_path.is_file():
-            files_to_search = [search_path]
-        else:
-            files_to_search = list(search_path.rglob(file_pattern))
-            files_to_search = [f for f in files_to_search if f.is_file()]
+        if not results:
+            return f"No matches found for pattern: {pattern}\n" \
+                   f"Searched {files_searched} files in: {path}"
 
-        for file_path in files_to_search:
-            # Skip binary files and common non-text files
-            if file_path.suffix in ['.pyc', '.so', '.o', '.a', '.exe', '.dll', '.bin']:
-                continue
+        # Format results, joining the pieces once at the end
+        parts = [
+            f"Grep search: {pattern}\n"
+            f"Path: {path}\n"
+            f"Files searched: {files_searched}\n"
+            f"Matches found: {len(results)}"
+        ]
 
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line_num, line in enumerate(f, 1):
-                        if regex.search(line):
-                            # Get relative path for cleaner output
-                            if search_path.is_dir():
-                                rel_path = file_path.relative_to(search_path)
-                            else:
-                                rel_path = file_path.name
-
-                            results.append({
-                                'file': str(rel_path),
-                                'line': line_num,
-                                'content': line.rstrip()
-                            })
-
-                            if len(results) >= max_results:
-                                break
+        if len(results) >= max_results:
+            parts.append(f" (limited to {max_results})")
 
-                files_searched += 1
+        parts.append("\n\n")
+        _format_results(parts, results)
 
-                if len(results) >= max_results:
-                    break
+        return "".join(parts)
 
-            except (PermissionError, UnicodeDecodeError):
-                # Skip files we can't read
-                continue
+    except Exception as e:
+        return f"Error performing grep search: {str(e)}"
 
-        if not results:
-            return f"No matches found for pattern: {pattern}\n" \
-                   f"Searched {files_searched} files in: {path}"
 
-        # Format results
-        output = f"Grep search: {pattern}\n" \
-                f"Path: {path}\n" \
-                f"Files searched: {files_searched}\n" \
-                f"Matches found: {len(results)}"
+@tool
+def grep_search_multi(
+    patterns: List[str],
+    path: str = ".",
+    file_pattern: str = "*",
+    case_sensitive: bool = False,
+    max_results: int = 100
+) -> str:
+    """Search for several text patterns in files at once.
+
+    Each file is read once and checked against every pattern, which is
+    faster than separate grep_search calls over the same files.
 
-        if len(results) >= max_results:
-            output += f" (limited to {max_results})"
+    Args:
+        patterns: Regular expression patterns to search for
+        path: Directory or file to search in (default: current directory)
+        file_pattern: Glob pattern for files to search (default: all files)
+        case_sensitive: Whether search is case sensitive (default: False)
+        max_results: Maximum number of results per pattern (default: 100)
+
+    Returns:
+        Matching lines for each pattern, with file names and line numbers
+
+    Examples:
+        grep_search_multi(["TODO", "FIXME"], path="src")
+        grep_search_multi(["def .*test", "class .*Test"], file_pattern="*.py")
+    """
+    try:
+        if not patterns:
+            return "Error: No patterns given"
+
+        search_path = Path(path).expanduser().resolve()
+
+        if not search_path.exists():
+            return f"Error: Path not found: {path}"
+
+        # Compile regex patterns
+        flags = 0 if case_sensitive else re.IGNORECASE
+        for pattern in patterns:
+            try:
+                _compile(pattern, flags)
+            except re.error as e:
+                return f"Error: Invalid regex pattern {pattern!r}: {str(e)}"
 
-        output += "\n\n"
+        searches = tuple(_plan_search(pattern, flags) for pattern in patterns)
+        all_results, files_searched = _python_search(searches, search_path, file_pattern, max_results)
 
-        # Group by file
-        current_file = None
-        for result in results:
-            if result['file'] != current_file:
-                current_file = result['file']
-                output += f"\n{current_file}:\n"
+        # Format results, one section per pattern
+        parts = [
+            f"Grep search: {len(patterns)} patterns\n"
+            f"Path: {path}\n"
+            f"Files searched: {files_searched}\n"
+        ]
 
-            output += f"  {result['line']:4d}: {result['content']}\n"
+        for pattern, results in zip(patterns, all_results):
+            parts.append(f"\nPattern: {pattern}\nMatches found: {len(results)}")
+            if len(results) >= max_results:
+                parts.append(f" (limited to {max_results})")
+            parts.append("\n")
+            _format_results(parts, results)
 
-        return output
+        return "".join(parts)
 
     except Exception as e:
         return f"Error performing grep search: {str(e)}"
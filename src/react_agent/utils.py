@@ -1,37 +1,134 @@
 """Utility functions and helpers for the ReactAgent."""
 
 import os
-from typing import Dict, Any, Optional
+import re
+import sys
+import time
+import atexit
+import queue
+import logging
+import threading
+import weakref
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 import json
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "speedups" extra
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values JSON has no type for, such as datetimes in metadata."""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def _dumps(data: Any, pretty: bool = True) -> bytes:
+        """Serialize data to JSON bytes with orjson."""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2 if pretty else orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, default=_json_default, option=option)
+
+    _loads = orjson.loads
+else:
+    def _dumps(data: Any, pretty: bool = True) -> bytes:
+        """Serialize data to JSON bytes with the standard library."""
+        if pretty:
+            return json.dumps(data, indent=2, default=_json_default).encode("utf-8")
+        return json.dumps(data, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+    _loads = json.loads
+
+
+def write_json(data: Any, filepath: str, pretty: bool = True):
+    """Serialize data and write it to a file in a single write.
+
+    Uses orjson when it is installed and falls back to the standard library.
+
+    Args:
+        data: JSON-serializable data
+        filepath: Path of the file to write
+        pretty: Indent the output by two spaces
+    """
+    Path(filepath).write_bytes(_dumps(data, pretty=pretty))
+
+
+def read_json(filepath: str) -> Any:
+    """Read a file in a single read and parse it as JSON.
+
+    Uses orjson when it is installed and falls back to the standard library.
+
+    Args:
+        filepath: Path of the file to read
+
+    Returns:
+        The parsed data
+    """
+    return _loads(Path(filepath).read_bytes())
+
+
+# A KEY=value line of a .env file, skipping comment lines. The key is
+# everything before the first "=", less an optional "export " prefix; the
+# value is either quoted (captured without its quotes) or bare, where a
+# "#" after whitespace starts a comment.
+_ENV_LINE = re.compile(
+    r"""^(?![^\S\n]*#)[^\S\n]*(?:export[^\S\n]+)?([^=\n]*)="""
+    r"""[^\S\n]*(?:"([^"\n]*)"|'([^'\n]*)'|(.*?))[^\S\n]*(?:[^\S\n]#.*)?$""",
+    re.MULTILINE
+)
+
+# Parsed .env files by resolved path, with the (mtime_ns, size) they were parsed at
+_env_cache: Dict[str, Tuple[int, int, Dict[str, str]]] = {}
+
 
 def load_env_config(env_file: str = ".env") -> Dict[str, str]:
     """Load configuration from .env file.
 
+    The parsed file is cached and only re-read when its modification time
+    or size changes.
+
     Args:
         env_file: Path to .env file
 
     Returns:
         Dictionary of environment variables
     """
-    config = {}
+    env_path = Path(env_file).resolve()
+    try:
+        st = env_path.stat()
+    except OSError:
+        return {}
+
+    cached = _env_cache.get(str(env_path))
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2].copy()
+
+    text = env_path.read_text()
+    config = {
+        key.strip(): double_quoted or single_quoted or bare
+        for key, double_quoted, single_quoted, bare in _ENV_LINE.findall(text)
+    }
 
-    env_path = Path(env_file)
-    if not env_path.exists():
-        return config
+    _env_cache[str(env_path)] = (st.st_mtime_ns, st.st_size, config)
+    return config.copy()
 
-    with open(env_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
 
-            if '=' in line:
-                key, value = line.split('=', 1)
-                config[key.strip()] = value.strip()
+# ReactAgent parameters read from the config: (parameter, key, default, conversion)
+_AGENT_CONFIG = (
+    ("model_name", "MODEL_NAME", "gpt-3.5-turbo", str),
+    ("base_url", "OPENAI_API_BASE", None, lambda value: value),
+    ("api_key", "OPENAI_API_KEY", "not-needed", str),
+    ("temperature", "TEMPERATURE", "0.7", float),
+    ("max_tokens", "MAX_TOKENS", "4096", int),
+    ("enable_langsmith", "LANGCHAIN_TRACING_V2", "false", lambda value: value.lower() == "true"),
+)
 
-    return config
+# Config keys exported to the environment when LangSmith tracing is enabled
+_LANGSMITH_KEYS = ("LANGCHAIN_API_KEY", "LANGCHAIN_ENDPOINT", "LANGCHAIN_PROJECT")
 
 
 def create_agent_from_config(config_file: str = ".env") -> "ReactAgent":
@@ -49,44 +146,51 @@ def create_agent_from_config(config_file: str = ".env") -> "ReactAgent":
     config = load_env_config(config_file)
 
     # Extract agent parameters
-    agent_params = {
-        "model_name": config.get("MODEL_NAME", "gpt-3.5-turbo"),
-        "base_url": config.get("OPENAI_API_BASE"),
-        "api_key": config.get("OPENAI_API_KEY", "not-needed"),
-        "temperature": float(config.get("TEMPERATURE", "0.7")),
-        "max_tokens": int(config.get("MAX_TOKENS", "4096")),
-        "enable_langsmith": config.get("LANGCHAIN_TRACING_V2", "false").lower() == "true",
-    }
+    agent_params = {param: cast(config.get(key, default)) for param, key, default, cast in _AGENT_CONFIG}
 
     # Set LangSmith env vars if enabled
     if agent_params["enable_langsmith"]:
-        if "LANGCHAIN_API_KEY" in config:
-            os.environ["LANGCHAIN_API_KEY"] = config["LANGCHAIN_API_KEY"]
-        if "LANGCHAIN_ENDPOINT" in config:
-            os.environ["LANGCHAIN_ENDPOINT"] = config["LANGCHAIN_ENDPOINT"]
-        if "LANGCHAIN_PROJECT" in config:
-            os.environ["LANGCHAIN_PROJECT"] = config["LANGCHAIN_PROJECT"]
+        os.environ.update({key: config[key] for key in _LANGSMITH_KEYS if key in config})
 
     return ReactAgent(**agent_params)
 
 
-def format_tool_output(output: str, max_length: int = 1000) -> str:
+def format_tool_output(output: Union[str, bytes, bytearray, memoryview], max_length: int = 1000) -> str:
     """Format and truncate tool output for display.
 
+    Raw subprocess output can be passed as bytes; only the part that is
+    kept is decoded.
+
     Args:
-        output: Raw tool output
-        max_length: Maximum length for output
+        output: Raw tool output (text, or UTF-8 bytes)
+        max_length: Maximum length for output (characters, or bytes for bytes input)
 
     Returns:
         Formatted output string
     """
+    if isinstance(output, str):
+        if len(output) <= max_length:
+            return output
+        return "".join((output[:max_length], "\n\n... [Output truncated - ", str(len(output)), " total characters]"))
+
+    head = bytes(output[:max_length]).decode("utf-8", errors="replace")
     if len(output) <= max_length:
-        return output
+        return head
+    return "".join((head, "\n\n... [Output truncated - ", str(len(output)), " total bytes]"))
+
 
-    truncated = output[:max_length]
-    return f"{truncated}\n\n... [Output truncated - {len(output)} total characters]"
+# Pricing as of 2024 (USD per 1K tokens)
+_PRICING = {
+    "gpt-4": {"prompt": 0.03, "completion": 0.06},
+    "gpt-4-turbo": {"prompt": 0.01, "completion": 0.03},
+    "gpt-3.5-turbo": {"prompt": 0.0005, "completion": 0.0015},
+}
 
+# (prompt, completion) USD per token
+_PER_TOKEN = {model: (rates["prompt"] / 1000, rates["completion"] / 1000) for model, rates in _PRICING.items()}
 
+
+@lru_cache(maxsize=4096)
 def estimate_cost(
     prompt_tokens: int,
     completion_tokens: int,
@@ -106,44 +210,59 @@ def estimate_cost(
         Prices are approximate and may not reflect actual costs.
         For local models, this returns 0.0.
     """
-    # Pricing as of 2024 (USD per 1K tokens)
-    pricing = {
-        "gpt-4": {"prompt": 0.03, "completion": 0.06},
-        "gpt-4-turbo": {"prompt": 0.01, "completion": 0.03},
-        "gpt-3.5-turbo": {"prompt": 0.0005, "completion": 0.0015},
-    }
+    rates = _PER_TOKEN.get(model)
 
     # Return 0 for local models or unknown models
-    if model not in pricing:
+    if rates is None:
         return 0.0
 
-    rates = pricing[model]
-    prompt_cost = (prompt_tokens / 1000) * rates["prompt"]
-    completion_cost = (completion_tokens / 1000) * rates["completion"]
-
-    return prompt_cost + completion_cost
+    return prompt_tokens * rates[0] + completion_tokens * rates[1]
 
 
 def save_conversation(
     messages: list,
     filepath: str,
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = None,
+    pretty: bool = False
 ):
     """Save conversation history to a file.
 
+    Messages are serialized and written one at a time, so only one encoded
+    message is held in memory; the output is the same as dumping the whole
+    document at once.
+
     Args:
         messages: List of conversation messages
         filepath: Path to save the conversation
         metadata: Optional metadata to include
+        pretty: Indent the output by two spaces (default: compact)
     """
-    data = {
-        "messages": messages,
-        "metadata": metadata or {},
-        "message_count": len(messages)
-    }
-
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
+    if not pretty:
+        with open(filepath, 'wb') as f:
+            f.write(b'{"messages":[')
+            separator = b""
+            for message in messages:
+                f.write(separator)
+                f.write(_dumps(message, pretty=False))
+                separator = b","
+            f.write(b'],"metadata":')
+            f.write(_dumps(metadata, pretty=False) if metadata else b"{}")
+            f.write(b',"message_count":%d}' % len(messages))
+        return
+
+    with open(filepath, 'wb') as f:
+        f.write(b'{\n  "messages": [')
+        separator = b"\n    "
+        for message in messages:
+            f.write(separator)
+            f.write(_dumps(message).replace(b"\n", b"\n    "))
+            separator = b",\n    "
+        f.write(b"\n  ]" if messages else b"]")
+
+        f.write(b',\n  "metadata": ')
+        # Empty metadata always encodes the same way, so skip building it
+        f.write(_dumps(metadata).replace(b"\n", b"\n  ") if metadata else b"{}")
+        f.write(b',\n  "message_count": %d\n}' % len(messages))
 
 
 def load_conversation(filepath: str) -> Dict[str, Any]:
@@ -155,24 +274,310 @@ def load_conversation(filepath: str) -> Dict[str, Any]:
     Returns:
         Dictionary with messages and metadata
     """
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    data = read_json(filepath)
+
+    # Every message repeats one of a few role strings; share one object per role
+    for message in data.get("messages", ()):
+        role = message.get("role") if isinstance(message, dict) else None
+        if type(role) is str:
+            message["role"] = sys.intern(role)
+
+    return data
+
+
+class RateLimiter:
+    """Token-bucket limiter for request and token rate limits.
+
+    Call ``acquire()`` before each request; it sleeps just long enough to
+    stay under both the requests-per-minute and tokens-per-minute budgets,
+    instead of hitting the server's limit and backing off afterwards.
+    """
+
+    def __init__(self, rpm: int = 500, tpm: int = 90_000):
+        """Initialize the rate limiter.
+
+        Args:
+            rpm: Maximum requests per minute
+            tpm: Maximum tokens per minute
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._request_budget = float(rpm)
+        self._token_budget = float(tpm)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the budget accumulated since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._request_budget = min(self.rpm, self._request_budget + elapsed * self.rpm / 60)
+        self._token_budget = min(self.tpm, self._token_budget + elapsed * self.tpm / 60)
+
+    def acquire(self, tokens: int = 0):
+        """Wait until a request of the given size fits in the budget.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+        """
+        # A request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.tpm)
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._request_budget >= 1 and self._token_budget >= tokens:
+                    self._request_budget -= 1
+                    self._token_budget -= tokens
+                    return
+
+                wait = max(
+                    (1 - self._request_budget) * 60 / self.rpm,
+                    (tokens - self._token_budget) * 60 / self.tpm
+                )
+
+            time.sleep(wait)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token budget once a request's real usage is known.
+
+        Args:
+            estimated_tokens: Tokens reserved by ``acquire()``
+            actual_tokens: Tokens the request actually used
+        """
+        with self._lock:
+            self._token_budget = min(self.tpm, self._token_budget + estimated_tokens - actual_tokens)
+
+
+# Bytes of encoded log records written to the log file at once, and default
+# number of records held in memory before they are handed to its handler
+_LOG_BUFFER_SIZE = 64 * 1024
+_LOG_BUFFER_RECORDS = 512
+
+
+class _BufferedFileHandler(logging.Handler):
+    """File handler that writes records in large batches.
+
+    ``logging.FileHandler`` flushes a text stream after every record; this
+    one encodes records into a bytearray and writes it to an append-only
+    descriptor with a single ``os.write`` when it fills, an ERROR arrives,
+    or on ``flush()`` or ``close()``.
+    """
+
+    def __init__(self, filename: str, encoding: str = "utf-8"):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.encoding = encoding
+        self._fd: Optional[int] = None  # Opened on the first write
+        self._buffer = bytearray()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._buffer += (self.format(record) + "\n").encode(self.encoding)
+            if record.levelno >= logging.ERROR or len(self._buffer) >= _LOG_BUFFER_SIZE:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self._buffer:
+                return
+            if self._fd is None:
+                self._fd = os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            with memoryview(self._buffer) as view:
+                written = 0
+                while written < len(view):
+                    written += os.write(self._fd, view[written:])
+            self._buffer.clear()
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            try:
+                self.flush()
+            finally:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                super().close()
+        finally:
+            self.release()
+
+
+# Second the cached log timestamp was formatted for, and its text
+_timestamp_cache = (-1, "")
+
+
+def _log_timestamp() -> str:
+    """Get the local time as "YYYY-MM-DD HH:MM:SS", formatted at most once per second."""
+    global _timestamp_cache
+    now = int(time.time())
+    second, text = _timestamp_cache
+    if now != second:
+        t = time.localtime(now)
+        text = f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+        _timestamp_cache = (now, text)
+    return text
+
+
+def _level_number(level: str) -> Optional[int]:
+    """Map a level name such as "INFO" to its numeric logging level, or None if logging doesn't know it."""
+    value = logging.getLevelName(level.upper())
+    return value if isinstance(value, int) else None
+
+
+# Queue of log file records and the one listener thread, shared by every
+# AgentLogger, that hands each record to its logger's file handler
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+_log_listener = None
+_log_listener_lock = threading.Lock()
+
+
+class _TaggingQueueHandler(logging.Handler):
+    """Enqueue records for the shared listener, tagged with the handler that writes them."""
+
+    def __init__(self, target: logging.Handler):
+        super().__init__()
+        self.target = target
+
+    def emit(self, record: logging.LogRecord):
+        # AgentLogger records carry a preformatted message and no arguments,
+        # so they can be queued as they are
+        record.target_handler = self.target
+        _log_queue.put_nowait(record)
+
+
+class _DispatchHandler(logging.Handler):
+    """Pass each dequeued record to the handler its AgentLogger tagged it with."""
+
+    def handle(self, record: logging.LogRecord):
+        record.target_handler.handle(record)
+
+
+def _ensure_log_listener():
+    """Start the shared listener thread if it isn't running."""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is None:
+            from logging.handlers import QueueListener
+
+            _log_listener = QueueListener(_log_queue, _DispatchHandler())
+            _log_listener.start()
+
+
+def _stop_log_listener():
+    """Write every queued record and stop the shared listener thread."""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            _log_listener.stop()
+            _log_listener = None
+
+
+atexit.register(_stop_log_listener)
+
+
+def _drain_log_queue():
+    """Block until the listener has handled every record queued so far."""
+    listener = _log_listener
+    # A logger collected on the listener thread itself can't wait for it
+    if listener is not None and threading.current_thread() is not listener._thread:
+        _log_queue.join()
+
+
+def _close_log_handlers(logger: logging.Logger, *handlers: logging.Handler):
+    """Detach a logger's handlers, write its queued records, then close its file handlers in order."""
+    logger.handlers.clear()
+    _drain_log_queue()
+    for handler in handlers:
+        handler.close()
 
 
 class AgentLogger:
-    """Simple logger for agent activities."""
+    """Simple logger for agent activities.
+
+    Console output is printed synchronously, so it stays in order with the
+    caller's own output. Log file records are put on a queue and written
+    by one background thread shared by every AgentLogger, so file output
+    never blocks the caller.
 
-    def __init__(self, log_file: Optional[str] = None, verbose: bool = True):
+    Call ``close()`` when done, or use the logger as a context manager;
+    a logger that is garbage collected or still open at exit is closed
+    then.
+    """
+
+    def __init__(
+        self,
+        log_file: Optional[str] = None,
+        verbose: bool = True,
+        level: str = "INFO",
+        buffer_size: int = _LOG_BUFFER_RECORDS
+    ):
         """Initialize the logger.
 
         Args:
             log_file: Optional file to write logs to
             verbose: Whether to print to console
+            level: Minimum level to print and write to the log file (INFO,
+                WARNING, ERROR); every message is kept in ``get_logs()``
+            buffer_size: Number of log file records held in memory before
+                they are written (ERRORs and flush() write immediately)
+
+        Raises:
+            ValueError: If level is not a logging level name
         """
+        levelno = _level_number(level)
+        if levelno is None:
+            raise ValueError(f"Unknown log level: {level}")
+
         self.log_file = log_file
         self.verbose = verbose
         self.logs = []
 
+        # Standalone logger: not registered with the logging hierarchy, so
+        # records never propagate to handlers configured on the root logger.
+        self._logger = logging.Logger(f"{__name__}.AgentLogger", levelno)
+
+        # Imported here so importing utils alone stays cheap
+        from logging.handlers import MemoryHandler
+
+        self._handlers = []
+        if log_file:
+            # Records are batched in memory and written in one go when the
+            # buffer fills, an ERROR arrives, or the logger is flushed
+            file_handler = _BufferedFileHandler(log_file)
+            memory_handler = MemoryHandler(max(1, buffer_size), flushLevel=logging.ERROR, target=file_handler)
+            self._handlers += [memory_handler, file_handler]
+
+            # Only enqueues each record; the shared listener thread does the I/O
+            self._logger.addHandler(_TaggingQueueHandler(memory_handler))
+            _ensure_log_listener()
+        if verbose:
+            self._logger.addHandler(logging.StreamHandler(sys.stdout))
+
+        # Closes the handlers once, on close(), collection or exit; it holds
+        # the handlers but not this object, so the object can be collected
+        self._finalizer = weakref.finalize(self, _close_log_handlers, self._logger, *self._handlers)
+
+    def is_enabled_for(self, level: str) -> bool:
+        """Check whether messages at a level would be printed and written to the log file.
+
+        Messages below the level are still kept in ``get_logs()``.
+
+        Args:
+            level: Log level (INFO, WARNING, ERROR)
+
+        Returns:
+            True if messages at this level are output
+        """
+        levelno = _level_number(level)
+        return levelno is None or self._logger.isEnabledFor(levelno)
+
     def log(self, message: str, level: str = "INFO"):
         """Log a message.
 
@@ -180,19 +585,20 @@ class AgentLogger:
             message: Message to log
             level: Log level (INFO, WARNING, ERROR)
         """
-        from datetime import datetime
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{level}] {message}"
+        log_entry = f"[{_log_timestamp()}] [{level}] {message}"
 
+        # Every entry is kept; the level only filters what is output
         self.logs.append(log_entry)
 
-        if self.verbose:
-            print(log_entry)
+        levelno = _level_number(level)
+        if levelno is None:
+            # Custom level names can't be ranked, so they are always output
+            levelno = max(self._logger.level, logging.INFO)
+        elif not self._logger.isEnabledFor(levelno):
+            return
 
-        if self.log_file:
-            with open(self.log_file, 'a') as f:
-                f.write(log_entry + "\n")
+        # Prints to the console, and only enqueues the record for the log file
+        self._logger.log(levelno, log_entry)
 
     def info(self, message: str):
         """Log an info message."""
@@ -214,11 +620,32 @@ class AgentLogger:
         """
         return self.logs.copy()
 
+    def flush(self):
+        """Block until all queued records have been written."""
+        if not self._finalizer.alive:
+            return
+
+        _drain_log_queue()
+        for handler in self._handlers:
+            handler.flush()
+
+    def close(self):
+        """Write any queued records and release the log handlers."""
+        self._finalizer()
+
+    def __enter__(self) -> "AgentLogger":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def save_logs(self, filepath: str):
         """Save logs to a file.
 
         Args:
             filepath: Path to save logs
         """
+        self.flush()
+
         with open(filepath, 'w') as f:
             f.write("\n".join(self.logs))
@@ -2,7 +2,7 @@
 
 import pytest
 from react_agent import ReactAgent
-from react_agent.context_manager import ContextManager, MessageRole
+from react_agent.context_manager import CompactionStrategy, ContextManager, MessageRole
 from react_agent.token_tracker import TokenTracker
 
 
@@ -120,13 +120,103 @@ class TestContextManager:
         assert new_count < original_count
         assert manager.compaction_count == 1
 
+    def test_compaction_merges_summaries(self):
+        """Test that a second compaction extends the first one's summary."""
+        manager = ContextManager(compaction_strategy=CompactionStrategy(keep_first_n=1, keep_last_n=2))
+        tracker = TokenTracker()
+        manager.add_message(MessageRole.SYSTEM, "You are helpful")
+        for i in range(5):
+            manager.add_message(MessageRole.USER, f"question {i}")
+        manager.compact(tracker)
+
+        for i in range(5, 8):
+            manager.add_message(MessageRole.USER, f"question {i}")
+        manager.compact(tracker)
+
+        messages = manager.get_messages()
+        summary = messages[1]["content"]
+        assert len(messages) == 4
+        assert summary.startswith("[Context Summary - 6 messages compressed]\n")
+        assert summary.count("[Context Summary") == 1
+        assert summary.splitlines()[1:] == [f"User asked: question {i}" for i in range(6)]
+        assert [m["content"] for m in messages[2:]] == ["question 6", "question 7"]
+        assert manager.compaction_count == 2
+        assert manager.get_state()["compaction_count"] == 2
+        assert manager.current_tokens(tracker) == tracker.count_messages_tokens(messages)
+
+        # Nothing aged out since the last compaction
+        assert manager.compact(tracker) == 0
+        assert manager.compaction_count == 2
+
+    def test_compaction_trims_summary(self):
+        """Test that every summary_trim_every compactions the carried summary is trimmed."""
+        strategy = CompactionStrategy(keep_first_n=0, keep_last_n=1, summary_max_tokens=20, summary_trim_every=3)
+        manager = ContextManager(compaction_strategy=strategy)
+        tracker = TokenTracker()
+
+        def compact_round(start):
+            for i in range(start, start + 10):
+                manager.add_message(MessageRole.USER, f"question {i}")
+            manager.compact(tracker)
+            return manager.get_messages()[0]["content"]
+
+        compact_round(0)
+        before_trim = compact_round(10)
+        assert before_trim.count("User asked") == 19
+
+        # The third compaction trims the 19 carried lines to whole lines
+        # within 20 tokens, then adds the 10 new ones
+        summary = compact_round(20)
+        lines = summary.splitlines()[1:]
+        carried = lines[:-10]
+        assert summary.startswith("[Context Summary - 29 messages compressed]\n")
+        assert 0 < len(carried) < 19
+        assert tracker.count_tokens("\n".join(carried)) <= strategy.summary_max_tokens
+        assert carried == [f"User asked: question {i}" for i in range(19 - len(carried), 19)]
+        assert lines[-10:] == [f"User asked: question {i}" for i in range(19, 29)]
+        assert manager.compaction_count == 3
+
+    def test_messages_keep_order(self):
+        """Test that messages come back in order across the head, middle and tail spans."""
+        manager = ContextManager(compaction_strategy=CompactionStrategy(keep_first_n=2, keep_last_n=3))
+        for i in range(8):
+            manager.add_message(MessageRole.USER, f"m{i}")
+
+        expected = [f"m{i}" for i in range(8)]
+        assert [m["content"] for m in manager.messages] == expected
+        assert [m["content"] for m in manager.view_messages()] == expected
+        assert len(manager) == 8
+
+    def test_strategy_change_keeps_order(self):
+        """Test that changing the strategy on a non-empty context keeps messages in order."""
+        manager = ContextManager(compaction_strategy=CompactionStrategy(keep_first_n=1, keep_last_n=2))
+        tracker = TokenTracker()
+        for i in range(5):
+            manager.add_message(MessageRole.USER, f"m{i}")
+
+        manager.compaction_strategy.keep_first_n = 3
+        manager.add_message(MessageRole.USER, "NEW")
+
+        assert [m["content"] for m in manager.messages] == ["m0", "m1", "m2", "m3", "m4", "NEW"]
+
+        manager.compaction_strategy = CompactionStrategy(keep_first_n=1, keep_last_n=1, summarize_middle=False)
+        manager.add_message(MessageRole.USER, "LAST")
+        manager.compact(tracker)
+
+        assert [m["content"] for m in manager.messages] == ["m0", "LAST"]
+        assert manager.current_tokens(tracker) == tracker.count_messages_tokens(manager.get_messages())
+
 
 class TestReactAgent:
     """Tests for ReactAgent."""
 
-    @pytest.fixture
-    def agent(self):
-        """Create a test agent."""
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def agent():
+        """Create a test agent, shared by the tests in this class.
+
+        Tests that change the agent's tools or subagents undo the change.
+        """
         return ReactAgent(
             model_name="gpt-3.5-turbo",
             base_url="http://localhost:1234/v1",
@@ -148,6 +238,7 @@ class TestReactAgent:
             "list_directory",
             "glob_search",
             "grep_search",
+            "grep_search_multi",
             "run_bash_command",
         ]
 
@@ -166,7 +257,10 @@ class TestReactAgent:
         original_count = len(agent.tools)
         agent.add_tool(custom_tool)
 
-        assert len(agent.tools) == original_count + 1
+        try:
+            assert len(agent.tools) == original_count + 1
+        finally:
+            agent.tools.pop()
 
     def test_create_subagent(self, agent):
         """Test creating a subagent."""
@@ -175,8 +269,11 @@ class TestReactAgent:
             system_prompt="You are a test agent"
         )
 
-        assert subagent.name == "test_subagent"
-        assert "test_subagent" in agent.subagents
+        try:
+            assert subagent.name == "test_subagent"
+            assert "test_subagent" in agent.subagents
+        finally:
+            agent.subagents.pop("test_subagent", None)
 
     def test_get_subagent(self, agent):
         """Test retrieving a subagent."""
@@ -185,12 +282,15 @@ class TestReactAgent:
             system_prompt="Test"
         )
 
-        retrieved = agent.get_subagent("test_agent")
-        assert retrieved is not None
-        assert retrieved.name == "test_agent"
+        try:
+            retrieved = agent.get_subagent("test_agent")
+            assert retrieved is not None
+            assert retrieved.name == "test_agent"
 
-        # Non-existent subagent
-        assert agent.get_subagent("nonexistent") is None
+            # Non-existent subagent
+            assert agent.get_subagent("nonexistent") is None
+        finally:
+            agent.subagents.pop("test_agent", None)
 
     def test_token_usage(self, agent):
         """Test token usage tracking."""
@@ -207,6 +307,48 @@ class TestReactAgent:
         assert "message_count" in state
         assert "max_tokens" in state
 
+    def test_run_batch(self, monkeypatch):
+        """Test that run_batch keeps task order, reports errors per task and limits concurrency."""
+        import threading
+        import time
+        from langchain_core.messages import AIMessage
+        from langchain_core.runnables import RunnableLambda
+
+        agent = ReactAgent(model_name="gpt-3.5-turbo", base_url="http://localhost:1234/v1", api_key="test-key")
+        lock = threading.Lock()
+        running = peak = 0
+
+        def fake_graph(state):
+            nonlocal running, peak
+            task = state["messages"][0]["content"]
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            try:
+                # Later tasks finish first
+                time.sleep(0.05 * (5 - int(task[-1])))
+                if task == "task 2":
+                    raise RuntimeError("tool crashed")
+                return {"messages": [AIMessage(content=f"done {task}")]}
+            finally:
+                with lock:
+                    running -= 1
+
+        monkeypatch.setattr(agent, "_get_agent_graph", lambda: RunnableLambda(fake_graph))
+        tasks = [f"task {i}" for i in range(5)]
+        responses = agent.run_batch(tasks, max_concurrency=2)
+
+        assert responses[:2] == ["done task 0", "done task 1"]
+        assert responses[2] == "Error executing task: tool crashed"
+        assert responses[3:] == ["done task 3", "done task 4"]
+        assert peak == 2
+
+        contents = [m["content"] for m in agent.context_manager.get_messages()[1:]]
+        assert contents[::2] == tasks
+        assert contents[1::2] == responses
+        assert len(agent.token_tracker.usage_history) == 4
+        assert agent.run_batch([]) == []
+
     def test_reset(self, agent):
         """Test resetting agent."""
         # Add some context
@@ -238,6 +380,27 @@ class TestTools:
         assert "Hello, World!" in result
         assert "test.txt" in result
 
+    def test_read_file_text_with_control_bytes(self, tmp_path):
+        """Test that UTF-8 text with ANSI colour codes is read and searched as text."""
+        from react_agent.tools import grep_search, read_file
+
+        test_file = tmp_path / "build.log"
+        test_file.write_text("\x1b[31mERROR\x1b[0m café\n" * 50, encoding="utf-8")
+
+        assert "\x1b[31mERROR\x1b[0m café" in read_file.func(str(test_file))
+        assert "Matches found: 50" in grep_search.func("ERROR", str(tmp_path))
+
+    def test_read_file_binary(self, tmp_path):
+        """Test that files with NUL bytes or invalid UTF-8 are reported as binary."""
+        from react_agent.tools import grep_search, read_file
+
+        (tmp_path / "nul.txt").write_bytes(b"ERROR\x00\x01\x02" * 100)
+        (tmp_path / "noise.txt").write_bytes(b"ERROR" + bytes(range(128, 256)) * 20)
+
+        for name in ("nul.txt", "noise.txt"):
+            assert "File appears to be binary" in read_file.func(str(tmp_path / name))
+        assert "No matches found" in grep_search.func("ERROR", str(tmp_path))
+
     def test_write_file_tool(self, tmp_path):
         """Test write_file tool."""
         from react_agent.tools import write_file
@@ -263,6 +426,30 @@ class TestTools:
         assert "file1.txt" in result
         assert "file2.txt" in result
 
+    def test_list_directory_max_entries(self, tmp_path):
+        """Test that list_directory stops after max_entries entries."""
+        from react_agent.tools import list_directory
+
+        for i in range(5):
+            (tmp_path / f"file{i}.txt").write_text("test")
+        (tmp_path / ".hidden").write_text("test")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "nested.txt").write_text("test")
+
+        result = list_directory.func(str(tmp_path), max_entries=3)
+        assert "file2.txt" in result
+        assert "file3.txt" not in result
+        assert result.endswith("\n... truncated after 3 entries")
+
+        # Hidden files don't count towards the cap, so exactly 6 entries fit
+        result = list_directory.func(str(tmp_path), max_entries=6)
+        assert "sub" in result
+        assert "truncated" not in result
+
+        result = list_directory.func(str(tmp_path), recursive=True, max_entries=6)
+        assert "nested.txt" not in result
+        assert result.endswith("\n... truncated after 6 entries")
+
     def test_glob_search_tool(self, tmp_path):
         """Test glob_search tool."""
         from react_agent.tools import glob_search
@@ -292,6 +479,411 @@ class TestTools:
         assert "Hello Again" in result
         assert "Foo Bar" not in result
 
+    def test_grep_search_inline_ignore_case(self, tmp_path):
+        """Test that an inline (?i) flag overrides case_sensitive=True."""
+        from react_agent.tools import grep_search
+
+        # Pure ASCII files are prefiltered on raw bytes, others on decoded text
+        (tmp_path / "ascii.txt").write_text("FOO a+b bar\nother")
+        (tmp_path / "unicode.txt").write_text("FOO café\nother", encoding="utf-8")
+
+        result = grep_search.func("(?i)foo", str(tmp_path), case_sensitive=True)
+
+        assert "FOO a+b bar" in result
+        assert "FOO café" in result
+        assert "other" not in result
+
+    def test_grep_search_crlf_and_class_operators(self, tmp_path):
+        """Test $ on CRLF files and class set operators, which re and ripgrep read differently."""
+        from react_agent.tools import grep_search
+
+        (tmp_path / "crlf.txt").write_bytes(b"ends with foo\r\nfoo in the middle\r\n")
+        (tmp_path / "ops.txt").write_text("a&b\nab\n")
+
+        result = grep_search.func("foo$", str(tmp_path))
+        assert "ends with foo" in result
+        assert "foo in the middle" not in result
+
+        # re reads [&&a] as a class of "&" and "a"; ripgrep would intersect
+        result = grep_search.func("[&&a]b", str(tmp_path))
+        assert "a&b" in result
+        assert "     2: ab" in result
+
+    def test_grep_search_re2_agrees_with_re(self, tmp_path):
+        """Test that patterns RE2 reads differently from re are searched with re."""
+        pytest.importorskip("re2")
+        from react_agent.tools import grep_search
+        from react_agent.tools.grep_tool import _compile_re2
+
+        (tmp_path / "test.txt").write_text("aab\nxyz\n")
+
+        assert _compile_re2("a{,2}b", 0) is None
+        assert _compile_re2("a{0,2}b", 0) is not None
+        assert "     1: aab" in grep_search.func("a{,2}b", str(tmp_path))
+
+    def test_run_bash_command_output_cap(self):
+        """Test that output over max_output_bytes keeps its head and tail."""
+        from react_agent.tools import run_bash_command
+
+        result = run_bash_command.func("head -c 5000 /dev/zero | tr '\\0' a; printf b", max_output_bytes=1000)
+
+        stdout = result.split("STDOUT:\n", 1)[1]
+        assert stdout == "a" * 500 + "\n... [truncated 4001 bytes] ...\n" + "a" * 499 + "b"
+
+    def test_capped_output_multibyte_boundary(self, monkeypatch):
+        """Test that characters cut by the head or tail cap are left out whole."""
+        from react_agent.tools import bash_tool
+
+        monkeypatch.setattr(bash_tool, "_ENCODING", "utf-8")
+        data = "é".encode("utf-8") * 1000
+
+        # The tail starts in the middle of a character
+        output = bash_tool._CappedOutput(1001)
+        for i in range(0, len(data), 7):
+            output.write(data[i:i + 7])
+        assert output.getvalue() == "é" * 250 + "\n... [truncated 1000 bytes] ...\n" + "é" * 250
+
+        # The head ends in the middle of a character
+        output = bash_tool._CappedOutput(1003)
+        output.write(data)
+        assert output.getvalue() == "é" * 250 + "\n... [truncated 998 bytes] ...\n" + "é" * 251
+
+        # Output under the cap is returned whole
+        output = bash_tool._CappedOutput(len(data))
+        output.write(data)
+        assert output.getvalue() == "é" * 1000
+
+    def test_grep_search_multi_tool(self, tmp_path):
+        """Test grep_search_multi tool."""
+        from react_agent.tools import grep_search_multi
+
+        # Create test file
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("Hello World\nFoo Bar\nHello Again")
+
+        result = grep_search_multi.func(["Hello", "Foo", "Missing"], str(test_file))
+
+        assert "Pattern: Hello\nMatches found: 2" in result
+        assert "Pattern: Foo\nMatches found: 1" in result
+        assert "Pattern: Missing\nMatches found: 0" in result
+
+
+class TestSubagent:
+    """Tests for Subagent."""
+
+    @pytest.fixture
+    def subagent(self):
+        """Create a test subagent."""
+        from react_agent.subagent import Subagent
+
+        return Subagent(name="worker", system_prompt="You are a test agent", llm=None)
+
+    def test_run_stream_updates_counters(self, subagent):
+        """Test that a streamed run updates the same counters as run()."""
+        chunks = list(subagent.run_stream("first task"))
+        assert chunks and "first task" in chunks[-1]
+        assert subagent.execution_count == 1
+        assert subagent.total_tokens_used == subagent.get_token_usage()["total_tokens"] > 0
+
+        result = subagent.run("second task")
+        assert result.success
+        assert subagent.execution_count == 2
+        assert subagent.total_tokens_used == result.token_usage["total_tokens"]
+
+    def test_run_stream_reports_errors(self, subagent, monkeypatch):
+        """Test that a failing streamed run yields the error instead of raising."""
+        def fail(*args, **kwargs):
+            raise RuntimeError("llm unavailable")
+
+        monkeypatch.setattr(subagent.token_tracker, "record_usage", fail)
+        chunks = list(subagent.run_stream("task"))
+
+        assert chunks == ["Error: llm unavailable"]
+        assert subagent.execution_count == 1
+        assert not subagent.run("task").success
+
+
+class TestConfig:
+    """Tests for .env configuration loading."""
+
+    def test_load_env_config(self, tmp_path):
+        """Test parsing quoted values, export prefixes and comments."""
+        from react_agent.utils import load_env_config
+
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "# comment\n"
+            "   # indented comment\n"
+            "MODEL_NAME=gpt-4\n"
+            "export OPENAI_API_BASE = http://localhost:1234/v1\n"
+            "OPENAI_API_KEY=\"sk-abc # not a comment\"\n"
+            "PROJECT='my project'\n"
+            "TEMPERATURE=0.2 # trailing comment\n"
+            "TAG=abc#def\n"
+            "URL=http://host/?a=b\n"
+            "EMPTY=\n"
+        )
+
+        assert load_env_config(str(env_file)) == {
+            "MODEL_NAME": "gpt-4",
+            "OPENAI_API_BASE": "http://localhost:1234/v1",
+            "OPENAI_API_KEY": "sk-abc # not a comment",
+            "PROJECT": "my project",
+            "TEMPERATURE": "0.2",
+            "TAG": "abc#def",
+            "URL": "http://host/?a=b",
+            "EMPTY": "",
+        }
+        assert load_env_config(str(tmp_path / "missing.env")) == {}
+
+    def test_load_env_config_cache(self, tmp_path):
+        """Test that the cached config is re-read once the file changes."""
+        import os
+        from react_agent.utils import load_env_config
+
+        env_file = tmp_path / ".env"
+        env_file.write_text("MODEL_NAME=gpt-4\n")
+        config = load_env_config(str(env_file))
+        config["MODEL_NAME"] = "changed by caller"
+        assert load_env_config(str(env_file)) == {"MODEL_NAME": "gpt-4"}
+
+        # Same size, newer modification time
+        env_file.write_text("MODEL_NAME=gpt-5\n")
+        stat = env_file.stat()
+        os.utime(env_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert load_env_config(str(env_file)) == {"MODEL_NAME": "gpt-5"}
+
+
+class TestConversationFiles:
+    """Tests for saving and loading conversations and contexts."""
+
+    MESSAGES = [
+        {"role": "system", "content": "You are helpful"},
+        {"role": "user", "content": "Héllo \"quoted\"\nsecond line"},
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "1", "function": {"name": "read_file"}}]},
+        {"role": "tool", "content": "1.5", "name": "read_file", "tool_call_id": "1"},
+    ]
+
+    @pytest.mark.parametrize("pretty", [False, True])
+    def test_save_load_conversation(self, tmp_path, pretty):
+        """Test that a saved conversation loads back unchanged in either layout."""
+        import json
+        from react_agent.utils import load_conversation, save_conversation
+
+        filepath = tmp_path / "conversation.json"
+        metadata = {"task": "demo", "score": 0.5}
+        save_conversation(self.MESSAGES, str(filepath), metadata=metadata, pretty=pretty)
+
+        expected = {"messages": self.MESSAGES, "metadata": metadata, "message_count": len(self.MESSAGES)}
+        assert load_conversation(str(filepath)) == expected
+        assert json.loads(filepath.read_text(encoding="utf-8")) == expected
+
+        save_conversation([], str(filepath), pretty=pretty)
+        assert load_conversation(str(filepath)) == {"messages": [], "metadata": {}, "message_count": 0}
+
+    @pytest.mark.parametrize("streamed", [True, False])
+    def test_import_context(self, tmp_path, monkeypatch, streamed):
+        """Test importing saved conversations and exported contexts, with and without ijson."""
+        from react_agent import context_manager
+        from react_agent.utils import save_conversation
+
+        if streamed:
+            pytest.importorskip("ijson")
+        else:
+            monkeypatch.setattr(context_manager, "ijson", None)
+
+        conversation = tmp_path / "conversation.json"
+        metadata = {"total_messages": 4, "compactions": 0, "tokens_saved": 0}
+        save_conversation(self.MESSAGES, str(conversation), metadata=metadata)
+        manager = ContextManager()
+        manager.import_context(str(conversation))
+        assert manager.get_messages() == self.MESSAGES
+        assert manager.metadata == metadata
+
+        exported = tmp_path / "context.json"
+        manager.compaction_count = 3
+        manager.export_context(str(exported), pretty=False)
+        restored = ContextManager()
+        restored.import_context(str(exported))
+        assert restored.get_messages() == self.MESSAGES
+        assert restored.metadata == manager.metadata
+        assert restored.compaction_count == 3
+
+        # A truncated file raises and leaves the context as it was
+        exported.write_bytes(exported.read_bytes()[:-20])
+        with pytest.raises(Exception):
+            restored.import_context(str(exported))
+        assert restored.get_messages() == self.MESSAGES
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Replace the limiter's clock with one that only advances when slept on."""
+        from react_agent import utils
+
+        class FakeClock:
+            def __init__(self):
+                self.now = 0.0
+                self.sleeps = []
+
+            def monotonic(self):
+                return self.now
+
+            def sleep(self, seconds):
+                self.sleeps.append(seconds)
+                self.now += seconds
+
+        clock = FakeClock()
+        monkeypatch.setattr(utils, "time", clock)
+        return clock
+
+    def test_request_budget_blocks(self, clock):
+        """Test that requests beyond rpm wait for the bucket to refill."""
+        from react_agent.utils import RateLimiter
+
+        limiter = RateLimiter(rpm=60, tpm=1_000_000)
+        for _ in range(60):
+            limiter.acquire()
+        assert clock.sleeps == []
+
+        limiter.acquire()
+        assert sum(clock.sleeps) == pytest.approx(1.0)
+
+    def test_token_budget_blocks(self, clock):
+        """Test that a request waits until enough tokens have refilled."""
+        from react_agent.utils import RateLimiter
+
+        limiter = RateLimiter(rpm=1000, tpm=600)  # 10 tokens per second
+        limiter.acquire(tokens=500)
+        assert clock.sleeps == []
+
+        limiter.acquire(tokens=200)
+        assert sum(clock.sleeps) == pytest.approx(10.0)
+
+        # A request larger than the bucket waits for a full bucket only
+        limiter.acquire(tokens=5000)
+        assert sum(clock.sleeps) == pytest.approx(70.0)
+
+    def test_refill_and_reconcile(self, clock):
+        """Test that the budget refills over time up to its cap and reconcile returns unused tokens."""
+        from react_agent.utils import RateLimiter
+
+        limiter = RateLimiter(rpm=1000, tpm=600)
+        limiter.acquire(tokens=600)
+
+        clock.now += 30  # Half the bucket refills
+        limiter.acquire(tokens=300)
+        assert clock.sleeps == []
+
+        limiter.reconcile(estimated_tokens=300, actual_tokens=100)
+        limiter.acquire(tokens=200)
+        assert clock.sleeps == []
+
+        clock.now += 3600  # Refills stop at the cap
+        limiter.acquire(tokens=600)
+        limiter.acquire(tokens=10)
+        assert sum(clock.sleeps) == pytest.approx(1.0)
+
+
+class TestAgentLogger:
+    """Tests for AgentLogger."""
+
+    def test_flush_and_close(self, tmp_path):
+        """Test that flush and close write buffered records to the log file."""
+        from react_agent.utils import AgentLogger
+
+        log_file = tmp_path / "agent.log"
+        logger = AgentLogger(log_file=str(log_file), verbose=False)
+        logger.info("first")
+        logger.flush()
+        assert "[INFO] first" in log_file.read_text()
+
+        logger.warning("second")
+        logger.close()
+        logger.close()  # Closing twice is harmless
+        assert "[WARNING] second" in log_file.read_text()
+
+        logger.info("after close")
+        assert "after close" not in log_file.read_text()
+        assert len(logger.get_logs()) == 3
+
+    def test_context_manager(self, tmp_path):
+        """Test that leaving the with block closes the logger."""
+        from react_agent.utils import AgentLogger
+
+        log_file = tmp_path / "agent.log"
+        with AgentLogger(log_file=str(log_file), verbose=False) as logger:
+            logger.error("failed")
+
+        assert "[ERROR] failed" in log_file.read_text()
+
+    def test_loggers_share_one_thread(self, tmp_path):
+        """Test that file loggers share one listener thread."""
+        import threading
+        from react_agent.utils import AgentLogger
+
+        AgentLogger(log_file=str(tmp_path / "warmup.log"), verbose=False).close()
+        thread_count = threading.active_count()
+
+        loggers = [AgentLogger(log_file=str(tmp_path / f"{i}.log"), verbose=False) for i in range(10)]
+        assert threading.active_count() == thread_count
+
+        for logger in loggers:
+            logger.close()
+
+    def test_console_output_in_order(self, capsys):
+        """Test that console output is printed before log() returns."""
+        from react_agent.utils import AgentLogger
+
+        with AgentLogger(verbose=True) as logger:
+            print("before")
+            logger.info("logged")
+            print("after")
+
+        assert capsys.readouterr().out.splitlines()[:3] == ["before", logger.get_logs()[0], "after"]
+
+
+class TestCustomTools:
+    """Tests for custom tool creation."""
+
+    def test_create_simple_tool_schema_per_annotation(self):
+        """Test that tools whose annotations share a name don't share a cached schema."""
+        from pydantic import BaseModel
+        from react_agent.mcp_client import create_simple_tool
+
+        def make_tool(field_type):
+            class Input(BaseModel):
+                value: field_type
+
+            def g(x: Input) -> str:
+                return str(x)
+
+            return create_simple_tool("g", "Echo the input", g)
+
+        int_tool = make_tool(int)
+        str_tool = make_tool(str)
+
+        assert int_tool.args_schema is not str_tool.args_schema
+        assert "5" in int_tool.invoke({"x": {"value": 5}})
+        assert "hello" in str_tool.invoke({"x": {"value": "hello"}})
+
+    def test_create_simple_tool_reuses_schema(self):
+        """Test that recreating the same tool reuses its schema but not the tool."""
+        from react_agent.mcp_client import create_simple_tool
+
+        def echo(text: str, times: int = 1) -> str:
+            return text * times
+
+        first = create_simple_tool("echo", "Repeat text", echo)
+        second = create_simple_tool("echo", "Repeat text", echo)
+
+        assert first is not second
+        assert first.args_schema is second.args_schema
+        assert second.invoke({"text": "ab", "times": 2}) == "abab"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])